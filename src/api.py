@@ -4,6 +4,7 @@ import os
 import uuid
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Query
 from fastapi.responses import FileResponse
@@ -140,6 +141,13 @@ class TTSCostComparison(BaseModel):
     recommended_provider: str
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Remove video muxer temp files left behind by earlier runs before serving."""
+    await asyncio.to_thread(video_muxer.cleanup_stale_temp_files)
+    yield
+
+
 # FastAPI app setup
 app = FastAPI(
     title="YouTube Transcription & Dubbing Service",
@@ -159,7 +167,8 @@ app = FastAPI(
     """,
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware for web clients
@@ -913,8 +922,10 @@ async def process_dubbing_background(job_id: str, request: DubbingRequest):
         # Update job as started
         jobs[job_id]["created_at"] = None  # Could add timestamp
         
-        # Process full dubbing pipeline
-        result = dubbing_service.process_dubbing_job(
+        # Process full dubbing pipeline in a worker thread; the pipeline (ffmpeg
+        # muxing included) is synchronous and would otherwise stall the event loop
+        result = await asyncio.to_thread(
+            dubbing_service.process_dubbing_job,
             request=request,
             progress_callback=update_progress
         )
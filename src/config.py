@@ -156,6 +156,8 @@ class Settings(BaseSettings):
     enable_translation: bool = True
     default_target_language: str = "en-US"
     default_translation_context: str = TranslationContext.CASUAL
+    translation_hedge_regions: int = 2  # Max regions queried at once for one chunk
+    translation_hedge_delay_seconds: float = 20.0  # Wait before backing up a slow region
     
     # ElevenLabs TTS settings
     elevenlabs_api_key: Optional[str] = None
@@ -166,6 +168,7 @@ class Settings(BaseSettings):
     # Video processing settings
     max_video_length_minutes: int = 30
     temp_video_dir: str = "/app/video_temp"  # Changed to avoid volume mount conflict completely
+    ffmpeg_caps_cache_file: Optional[str] = None  # Default: ~/.cache/youtube-transcription/ffmpeg_caps.json
     enable_video_preview: bool = True
     
     # Dubbing quality settings
@@ -2,14 +2,111 @@
 
 import os
 import re
+import json
+import uuid
+import asyncio
 import datetime
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Callable
+from functools import lru_cache
 from pathlib import Path
+from dataclasses import dataclass, asdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..config import settings
 from ..utils.colors import Colors
 
 
+# ElevenLabs output formats by audio quality setting
+_QUALITY_FORMATS = {
+    "low": "mp3_22050_32",
+    "medium": "mp3_44100_64",
+    "high": "mp3_44100_128"
+}
+_DEFAULT_OUTPUT_FORMAT = _QUALITY_FORMATS["high"]
+
+
+def _dump_json(payload: Dict) -> bytes:
+    """Serialize a request payload to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+@dataclass(slots=True, frozen=True)
+class _Segment:
+    """A timed script line prepared for synthesis."""
+    text: str
+    start_time: float
+    original_line: str
+    end_time: float
+    
+    def to_dict(self) -> Dict:
+        """Return the segment as a plain dictionary."""
+        return asdict(self)
+
+
+# Timestamp pattern [HH:MM:SS] or [H:MM:SS] followed by the line text
+_TIMESTAMP_LINE_RE = re.compile(r'\[(\d{1,2}):(\d{2}):(\d{2})\]\s*(.*)')
+_TTS_BRACKETS_RE = re.compile(r'[\[\]{}]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _clean_text_for_tts(text: str) -> str:
+    """Clean text for better TTS synthesis."""
+    # Remove or replace problematic characters
+    text = _TTS_BRACKETS_RE.sub('', text)  # Remove brackets and braces
+    text = _WHITESPACE_RE.sub(' ', text)  # Normalize whitespace
+    text = text.strip()
+    
+    # Don't synthesize very short or meaningless text
+    if len(text) < 3:
+        return ""
+    
+    return text
+
+
+@lru_cache(maxsize=128)
+def _parse_script_cached(script: str) -> Tuple[_Segment, ...]:
+    """
+    Parse a timestamped script into immutable segments.
+    
+    Pure function of the script text, so results are memoized; the cache is
+    bounded to keep long-running servers from growing without limit.
+    """
+    parsed = []
+    
+    for line in script.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        
+        timestamp_match = _TIMESTAMP_LINE_RE.match(line)
+        if timestamp_match:
+            hours, minutes, seconds, text = timestamp_match.groups()
+            start_time = int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+            
+            # Filter out pause markers and empty text
+            if text and not text.startswith('[') and text.strip():
+                clean_text = _clean_text_for_tts(text.strip())
+                if clean_text:
+                    parsed.append((clean_text, start_time, line))
+    
+    segments = []
+    for i, (text, start_time, line) in enumerate(parsed):
+        if i + 1 < len(parsed):
+            end_time = parsed[i + 1][1] - 0.1
+        else:
+            # Estimate duration of the last segment (~150 wpm = 2.5 words/second)
+            end_time = start_time + max(len(text.split()) / 2.5, 1.0)
+        segments.append(_Segment(text, start_time, line, end_time))
+    
+    return tuple(segments)
+
+
 class VoiceNotFoundError(Exception):
     """Raised when a requested voice ID is not found."""
     pass
@@ -28,6 +125,7 @@ class ElevenLabsSynthesizer:
         self.base_url = settings.elevenlabs_base_url
         self.default_voice = settings.elevenlabs_default_voice
         self.model = settings.elevenlabs_model
+        self._ensured_dirs = set()
         
         if not self.api_key:
             print(Colors.WARNING + "⚠ ElevenLabs API key not configured!" + Colors.ENDC)
@@ -39,7 +137,8 @@ class ElevenLabsSynthesizer:
                          output_path: str,
                          model: Optional[str] = None,
                          optimize_streaming: bool = False,
-                         audio_quality: str = "high") -> Dict:
+                         audio_quality: str = "high",
+                         progress_callback: Optional[Callable[[str, int], None]] = None) -> Dict:
         """
         Synthesize timed script to audio file using ElevenLabs API.
         
@@ -50,6 +149,7 @@ class ElevenLabsSynthesizer:
             model: TTS model to use (defaults to config)
             optimize_streaming: Optimize for streaming latency
             audio_quality: Audio quality (low, medium, high)
+            progress_callback: Optional callback receiving (message, percentage)
             
         Returns:
             Dictionary with synthesis result and metadata
@@ -61,6 +161,8 @@ class ElevenLabsSynthesizer:
             raise SynthesisError("ElevenLabs API key not configured")
         
         try:
+            self._ensure_dir(output_path)
+            
             # Convert script to ElevenLabs format
             segments = self._script_to_elevenlabs_format(script_text)
             if not segments:
@@ -70,11 +172,15 @@ class ElevenLabsSynthesizer:
             print(Colors.CYAN + f"   ├─ Voice: {voice_id}" + Colors.ENDC)
             
             # Determine synthesis method based on content length
-            total_chars = sum(len(segment['text']) for segment in segments)
+            total_chars = sum(len(segment.text) for segment in segments)
+            
+            if progress_callback:
+                progress_callback("Audio synthesis indítása", 0)
             
             if len(segments) > 50 or total_chars > 10000:
                 # Use chunked synthesis for long content
-                result = self._synthesize_chunked(segments, voice_id, output_path, model, audio_quality)
+                result = self._synthesize_chunked(segments, voice_id, output_path, model, audio_quality,
+                                                  progress_callback)
             else:
                 # Use single API call for short content
                 result = self._synthesize_single_call(segments, voice_id, output_path, model, audio_quality)
@@ -93,13 +199,16 @@ class ElevenLabsSynthesizer:
             
             print(Colors.GREEN + f"   ✓ Audio synthesis kész: {result.get('duration_seconds', 0):.1f}s audio" + Colors.ENDC)
             
+            if progress_callback:
+                progress_callback("Audio synthesis kész", 100)
+            
             return result
             
         except Exception as e:
             print(Colors.FAIL + f"✗ ElevenLabs synthesis hiba: {e}" + Colors.ENDC)
             raise SynthesisError(f"Audio synthesis failed: {e}")
     
-    def _synthesize_single_call(self, segments: List[Dict], voice_id: str, 
+    def _synthesize_single_call(self, segments: List[_Segment], voice_id: str, 
                               output_path: str, model: Optional[str], 
                               audio_quality: str) -> Dict:
         """Synthesize audio using single API call for shorter content."""
@@ -107,7 +216,7 @@ class ElevenLabsSynthesizer:
             import httpx
             
             # Combine all text segments
-            full_text = ' '.join(segment['text'] for segment in segments if segment['text'].strip())
+            full_text = ' '.join(segment.text for segment in segments if segment.text.strip())
             
             print(Colors.CYAN + f"   ├─ Single API call synthesis ({len(full_text)} karakter)" + Colors.ENDC)
             
@@ -122,18 +231,12 @@ class ElevenLabsSynthesizer:
                         "xi-api-key": self.api_key,
                         "Content-Type": "application/json"
                     },
-                    json={
-                        "text": full_text,
-                        "model_id": model or self.model,
-                        "output_format": output_format,
-                        "voice_settings": self._get_voice_settings(audio_quality)
-                    }
+                    params={"output_format": output_format},
+                    content=self._build_request_body(full_text, model, audio_quality)
                 )
                 
                 if response.status_code == 200:
                     # Save audio file
-                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                    
                     with open(output_path, "wb") as f:
                         f.write(response.content)
                     
@@ -157,9 +260,10 @@ class ElevenLabsSynthesizer:
         except ImportError:
             raise SynthesisError("httpx library not installed. Run: pip install httpx")
     
-    def _synthesize_chunked(self, segments: List[Dict], voice_id: str, 
+    def _synthesize_chunked(self, segments: List[_Segment], voice_id: str, 
                           output_path: str, model: Optional[str], 
-                          audio_quality: str) -> Dict:
+                          audio_quality: str,
+                          progress_callback: Optional[Callable[[str, int], None]] = None) -> Dict:
         """Synthesize audio using chunked approach for longer content."""
         print(Colors.YELLOW + f"   📑 Chunked audio synthesis ({len(segments)} segments)" + Colors.ENDC)
         
@@ -172,58 +276,54 @@ class ElevenLabsSynthesizer:
             print(Colors.CYAN + f"   ├─ {len(chunks)} audio chunk készítése" + Colors.ENDC)
             
             output_format = self._get_output_format(audio_quality)
-            temp_files = []
+            chunk_audio = []
             total_cost = 0.0
             
+            # Report progress in ~5% steps rather than once per chunk
+            progress_step = max(1, len(chunks) // 20)
+            last_reported = 0
+            
             with httpx.Client(timeout=300.0) as client:
                 for i, (chunk_segments, start_time, end_time) in enumerate(chunks):
-                    chunk_text = ' '.join(seg['text'] for seg in chunk_segments if seg['text'].strip())
+                    chunk_text = ' '.join(seg.text for seg in chunk_segments if seg.text.strip())
                     if not chunk_text.strip():
                         continue
                     
                     print(Colors.CYAN + f"   ├─ Chunk {i+1}/{len(chunks)} synthesis ({len(chunk_text)} kar.)" + Colors.ENDC)
                     
-                    # Create temporary file for chunk
-                    temp_file = f"{output_path}.chunk_{i}.mp3"
-                    temp_files.append(temp_file)
-                    
-                    # Synthesize chunk
+                    # Synthesize chunk (high quality mp3 is the standard for chunking)
                     response = client.post(
                         f"{self.base_url}/text-to-speech/{voice_id}",
                         headers={
                             "xi-api-key": self.api_key,
                             "Content-Type": "application/json"
                         },
-                        json={
-                            "text": chunk_text,
-                            "model_id": model or self.model,
-                            "output_format": "mp3_44100_128",  # Standard for chunking
-                            "voice_settings": self._get_voice_settings(audio_quality)
-                        }
+                        params={"output_format": _DEFAULT_OUTPUT_FORMAT},
+                        content=self._build_request_body(chunk_text, model, audio_quality)
                     )
                     
                     if response.status_code != 200:
                         raise SynthesisError(f"Chunk {i+1} synthesis failed: {response.text}")
                     
-                    with open(temp_file, "wb") as f:
-                        f.write(response.content)
+                    # Keep chunk audio in memory; it is decoded once during merge
+                    chunk_audio.append((response.content, start_time, end_time))
                     
                     total_cost += self._estimate_synthesis_cost(len(chunk_text))
                     print(Colors.GREEN + f"   ✓ Chunk {i+1} kész" + Colors.ENDC)
+                    
+                    done = i + 1
+                    if progress_callback and (done - last_reported >= progress_step or done == len(chunks)):
+                        # Chunk synthesis covers 0-90%, merging the rest
+                        progress_callback(f"Chunk synthesis {done}/{len(chunks)}", done * 90 // len(chunks))
+                        last_reported = done
             
             # Merge audio chunks
             print(Colors.CYAN + "   ├─ Audio chunk-ok egyesítése..." + Colors.ENDC)
-            merged_audio = self._merge_audio_chunks(temp_files, chunks)
+            merged_audio = self._merge_audio_chunks(chunk_audio)
             
             # Save final file
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
             merged_audio.export(output_path, format=self._get_pydub_format(output_format))
             
-            # Cleanup temp files
-            for temp_file in temp_files:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            
             # Get final file info
             file_size = os.path.getsize(output_path)
             duration = len(merged_audio) / 1000.0  # Convert ms to seconds
@@ -245,61 +345,30 @@ class ElevenLabsSynthesizer:
             missing_lib = "httpx" if "httpx" not in str(e) else "pydub"
             raise SynthesisError(f"Required library not installed: {missing_lib}. Run: pip install {missing_lib}")
     
-    def _script_to_elevenlabs_format(self, script: str) -> List[Dict]:
+    def _ensure_dir(self, path: str):
+        """Create the parent directory of path once per synthesizer instance."""
+        directory = os.path.dirname(path)
+        if directory and directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
+    
+    def _build_request_body(self, text: str, model: Optional[str], audio_quality: str) -> bytes:
+        """Build the serialized JSON body for a text-to-speech request."""
+        return _dump_json({
+            "text": text,
+            "model_id": model or self.model,
+            "voice_settings": self._get_voice_settings(audio_quality)
+        })
+    
+    def _script_to_elevenlabs_format(self, script: str) -> List[_Segment]:
         """Convert timestamped script to ElevenLabs segment format."""
-        segments = []
-        lines = script.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Match timestamp pattern [HH:MM:SS] or [H:MM:SS] or [M:SS]
-            timestamp_match = re.match(r'\\[(\\d{1,2}):(\\d{2}):(\\d{2})\\]\\s*(.*)', line)
-            
-            if timestamp_match:
-                hours, minutes, seconds, text = timestamp_match.groups()
-                start_time = int(hours) * 3600 + int(minutes) * 60 + int(seconds)
-                
-                # Filter out pause markers and empty text
-                if text and not text.startswith('[') and text.strip():
-                    # Clean text for TTS
-                    clean_text = self._clean_text_for_tts(text.strip())
-                    if clean_text:
-                        segments.append({
-                            "text": clean_text,
-                            "start_time": start_time,
-                            "original_line": line
-                        })
-        
-        # Calculate end times
-        for i in range(len(segments) - 1):
-            segments[i]["end_time"] = segments[i + 1]["start_time"] - 0.1
-        
-        # Set end time for last segment
-        if segments:
-            last_segment = segments[-1]
-            # Estimate duration based on text length (roughly 150 words per minute)
-            estimated_duration = len(last_segment["text"].split()) / 2.5  # ~150 wpm = 2.5 words/second
-            last_segment["end_time"] = last_segment["start_time"] + max(estimated_duration, 1.0)
-        
-        return segments
+        return list(_parse_script_cached(script))
     
     def _clean_text_for_tts(self, text: str) -> str:
         """Clean text for better TTS synthesis."""
-        # Remove or replace problematic characters
-        text = re.sub(r'[\\[\\]{}]', '', text)  # Remove brackets and braces
-        text = re.sub(r'\\s+', ' ', text)  # Normalize whitespace
-        text = text.strip()
-        
-        # Don't synthesize very short or meaningless text
-        if len(text) < 3:
-            return ""
-        
-        return text
+        return _clean_text_for_tts(text)
     
-    def _group_segments_into_chunks(self, segments: List[Dict], max_chars: int = 500) -> List[Tuple[List[Dict], float, float]]:
+    def _group_segments_into_chunks(self, segments: List[_Segment], max_chars: int = 500) -> List[Tuple[List[_Segment], float, float]]:
         """Group segments into chunks for efficient synthesis."""
         chunks = []
         current_chunk = []
@@ -307,11 +376,11 @@ class ElevenLabsSynthesizer:
         chunk_start_time = None
         
         for segment in segments:
-            segment_chars = len(segment['text'])
+            segment_chars = len(segment.text)
             
             # Start new chunk if needed
             if chunk_start_time is None:
-                chunk_start_time = segment['start_time']
+                chunk_start_time = segment.start_time
             
             # Add to current chunk if within limits
             if current_chars + segment_chars <= max_chars and len(current_chunk) < 20:
@@ -320,32 +389,33 @@ class ElevenLabsSynthesizer:
             else:
                 # Finish current chunk
                 if current_chunk:
-                    chunk_end_time = current_chunk[-1].get('end_time', current_chunk[-1]['start_time'] + 1)
+                    chunk_end_time = current_chunk[-1].end_time
                     chunks.append((current_chunk, chunk_start_time, chunk_end_time))
                 
                 # Start new chunk
                 current_chunk = [segment]
                 current_chars = segment_chars
-                chunk_start_time = segment['start_time']
+                chunk_start_time = segment.start_time
         
         # Add final chunk
         if current_chunk:
-            chunk_end_time = current_chunk[-1].get('end_time', current_chunk[-1]['start_time'] + 1)
+            chunk_end_time = current_chunk[-1].end_time
             chunks.append((current_chunk, chunk_start_time, chunk_end_time))
         
         return chunks
     
-    def _merge_audio_chunks(self, temp_files: List[str], chunks: List[Tuple]) -> 'AudioSegment':
-        """Merge audio chunks with proper timing."""
+    def _merge_audio_chunks(self, chunk_audio: List[Tuple[bytes, float, float]]) -> 'AudioSegment':
+        """Merge in-memory audio chunks with proper timing."""
         try:
+            import io
             from pydub import AudioSegment
             
-            # Load all audio chunks
+            # Decode all audio chunks straight from the response bytes
             audio_chunks = []
-            for temp_file, (chunk_segments, start_time, end_time) in zip(temp_files, chunks):
-                if os.path.exists(temp_file):
-                    chunk_audio = AudioSegment.from_mp3(temp_file)
-                    audio_chunks.append((chunk_audio, start_time, end_time))
+            for content, start_time, end_time in chunk_audio:
+                if content:
+                    decoded = AudioSegment.from_file(io.BytesIO(content), format="mp3")
+                    audio_chunks.append((decoded, start_time, end_time))
             
             if not audio_chunks:
                 raise SynthesisError("No audio chunks to merge")
@@ -368,12 +438,7 @@ class ElevenLabsSynthesizer:
     
     def _get_output_format(self, quality: str) -> str:
         """Get ElevenLabs output format based on quality setting."""
-        quality_formats = {
-            "low": "mp3_22050_32",
-            "medium": "mp3_44100_64", 
-            "high": "mp3_44100_128"
-        }
-        return quality_formats.get(quality, "mp3_44100_128")
+        return _QUALITY_FORMATS.get(quality, _DEFAULT_OUTPUT_FORMAT)
     
     def _get_pydub_format(self, elevenlabs_format: str) -> str:
         """Convert ElevenLabs format to pydub format."""
@@ -494,6 +559,134 @@ class ElevenLabsSynthesizer:
         
         voices = self.get_available_voices()
         return any(voice['voice_id'] == voice_id for voice in voices)
+    
+    def as_pool(self, max_concurrency: int = 4) -> 'SynthesisPool':
+        """Wrap this synthesizer in a request pool for concurrent server use."""
+        return SynthesisPool(self, max_concurrency=max_concurrency)
+
+
+class SynthesisPool:
+    """
+    Asyncio request pool for concurrent synthesize_script calls.
+    
+    Requests are queued on submit() and picked up by a single background
+    loop. Each loop iteration drains everything queued so far and runs it
+    concurrently, so requests arriving mid-iteration join the next one
+    instead of waiting behind a lock. Per-request state lives in the pool
+    dict, keyed by request ID. Must be used from within a running event loop.
+    """
+    
+    def __init__(self, synthesizer: ElevenLabsSynthesizer, max_concurrency: int = 4):
+        self.synthesizer = synthesizer
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._pool: Dict[str, Dict] = {}
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._worker: Optional[asyncio.Task] = None
+    
+    def submit(self, script_text: str, voice_id: str, output_path: str, **kwargs) -> str:
+        """Queue a synthesis request and return its request ID."""
+        request_id = str(uuid.uuid4())
+        self._pool[request_id] = {
+            'status': 'queued',
+            'script_text': script_text,
+            'voice_id': voice_id,
+            'output_path': output_path,
+            'kwargs': kwargs,
+            'result': None,
+            'error': None,
+            'done': asyncio.Event()
+        }
+        self._queue.put_nowait(request_id)
+        
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        
+        return request_id
+    
+    def get_status(self, request_id: str) -> Optional[str]:
+        """Get the status of a pooled request (queued, processing, completed, failed, cancelled)."""
+        item = self._pool.get(request_id)
+        return item['status'] if item else None
+    
+    async def wait(self, request_id: str) -> Dict:
+        """Wait for a request to finish and return its synthesis result."""
+        item = self._pool.get(request_id)
+        if item is None:
+            raise KeyError(f"Unknown synthesis request: {request_id}")
+        
+        await item['done'].wait()
+        self._pool.pop(request_id, None)
+        
+        if item['error'] is not None:
+            raise item['error']
+        return item['result']
+    
+    async def close(self):
+        """Stop the background loop. Unfinished requests fail with CancelledError."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        # Drop requests the loop never picked up
+        while True:
+            try:
+                self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        
+        # Anything still unfinished (queued, or waiting on the semaphore) would
+        # otherwise keep its waiters blocked
+        for item in self._pool.values():
+            if not item['done'].is_set():
+                self._cancel_item(item)
+    
+    @staticmethod
+    def _cancel_item(item: Dict):
+        """Mark a pooled request as cancelled and wake its waiters."""
+        item['error'] = asyncio.CancelledError("Synthesis pool closed")
+        item['status'] = 'cancelled'
+        item['done'].set()
+    
+    async def _run(self):
+        """Drain the queue and process each batch concurrently."""
+        while True:
+            batch = [await self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            await asyncio.gather(*(self._process(request_id) for request_id in batch))
+    
+    async def _process(self, request_id: str):
+        """Run one pooled request in a worker thread."""
+        item = self._pool[request_id]
+        
+        try:
+            async with self._semaphore:
+                item['status'] = 'processing'
+                item['result'] = await asyncio.to_thread(
+                    self.synthesizer.synthesize_script,
+                    item['script_text'],
+                    item['voice_id'],
+                    item['output_path'],
+                    **item['kwargs']
+                )
+                item['status'] = 'completed'
+        except asyncio.CancelledError:
+            # Also covers requests cancelled while still waiting for the semaphore
+            self._cancel_item(item)
+            raise
+        except Exception as e:
+            item['error'] = e if isinstance(e, SynthesisError) else SynthesisError(str(e))
+            item['status'] = 'failed'
+        finally:
+            item['done'].set()
 
 
 class ElevenLabsSynthesizerAdapter:
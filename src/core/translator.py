@@ -1,8 +1,14 @@
 """Context-aware translation module using Vertex AI."""
 
+import io
 import re
+import hashlib
 import datetime
-from typing import Optional, Dict, List, Tuple
+import threading
+from functools import lru_cache
+from collections import OrderedDict, deque
+from typing import Optional, Dict, List, Tuple, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from enum import Enum
 
 from ..config import settings, VertexAIModels, TranslationContext
@@ -10,6 +16,86 @@ from ..utils.colors import Colors
 from ..utils.chunking import TranscriptChunker
 
 
+# Supported target languages, as listed by get_supported_languages
+_LANGUAGES = (
+    {"code": "en-US", "name": "English (US)", "native": "English"},
+    {"code": "en-GB", "name": "English (UK)", "native": "English"},
+    {"code": "de-DE", "name": "German", "native": "Deutsch"},
+    {"code": "fr-FR", "name": "French", "native": "Français"},
+    {"code": "es-ES", "name": "Spanish", "native": "Español"},
+    {"code": "it-IT", "name": "Italian", "native": "Italiano"},
+    {"code": "pt-PT", "name": "Portuguese", "native": "Português"},
+    {"code": "ru-RU", "name": "Russian", "native": "Русский"},
+    {"code": "zh-CN", "name": "Chinese (Simplified)", "native": "中文"},
+    {"code": "ja-JP", "name": "Japanese", "native": "日本語"},
+    {"code": "ko-KR", "name": "Korean", "native": "한국어"},
+    {"code": "ar-SA", "name": "Arabic", "native": "العربية"},
+    {"code": "hi-IN", "name": "Hindi", "native": "हिन्दी"},
+    {"code": "th-TH", "name": "Thai", "native": "ไทย"},
+    {"code": "tr-TR", "name": "Turkish", "native": "Türkçe"},
+    {"code": "pl-PL", "name": "Polish", "native": "Polski"},
+    {"code": "nl-NL", "name": "Dutch", "native": "Nederlands"},
+    {"code": "sv-SE", "name": "Swedish", "native": "Svenska"},
+    {"code": "da-DK", "name": "Danish", "native": "Dansk"},
+    {"code": "no-NO", "name": "Norwegian", "native": "Norsk"}
+)
+
+_VERTEX_INIT_LOCK = threading.Lock()
+
+# Process-wide LRU of chunk translations, keyed by content hash and translation settings
+_TRANSLATION_CACHE_SIZE = 8192
+_translation_cache = OrderedDict()
+_translation_cache_lock = threading.Lock()
+
+
+def _translation_cache_get(key: Tuple) -> Optional[str]:
+    """Return a cached translation and mark it as recently used."""
+    with _translation_cache_lock:
+        translated = _translation_cache.get(key)
+        if translated is not None:
+            _translation_cache.move_to_end(key)
+        return translated
+
+
+def _translation_cache_put(key: Tuple, translated: str) -> None:
+    """Store a translation, evicting the least recently used entry when full."""
+    with _translation_cache_lock:
+        _translation_cache[key] = translated
+        _translation_cache.move_to_end(key)
+        if len(_translation_cache) > _TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+
+
+def clear_translation_cache() -> None:
+    """Drop all cached chunk translations."""
+    with _translation_cache_lock:
+        _translation_cache.clear()
+
+_BATCH_MARKER_RE = re.compile(r'^\s*<<<CHUNK (\d+)>>>\s*$', re.MULTILINE)
+
+# Fixed-width [HH:MM:SS] check done on all 10 bytes at once (little-endian lanes).
+# XOR with the template zeroes the bracket/colon lanes and turns digit lanes into
+# their numeric value; adding (0x80 - limit) to a lane sets its high bit iff the
+# lane value is >= limit (10 for digits, 6 for the minute/second tens digit).
+_TIMESTAMP_TEMPLATE = int.from_bytes(b'[00:00:00]', 'little')
+_TIMESTAMP_SEPARATOR_MASK = int.from_bytes(b'\xff\x00\x00\xff\x00\x00\xff\x00\x00\xff', 'little')
+_TIMESTAMP_LIMIT_ADD = int.from_bytes(b'\x00\x76\x76\x00\x7a\x76\x00\x7a\x76\x00', 'little')
+_TIMESTAMP_HIGH_BITS = int.from_bytes(b'\x00\x80\x80\x00\x80\x80\x00\x80\x80\x00', 'little')
+
+# Per-call part of the translation prompt, wrapped around the script text; the
+# static part is cached per (context, quality)
+_PROMPT_HEADER_TEMPLATE = """
+CÉLNYELV: {target_language}
+- Célközönség: {audience}
+- Kívánt hangvétel: {tone}
+
+EREDETI MAGYAR SCRIPT:
+"""
+_PROMPT_FOOTER_TEMPLATE = """
+
+LEFORDÍTOTT {target_language_upper} SCRIPT:"""
+
+
 class TranslationQuality(str, Enum):
     """Translation quality levels."""
     FAST = "fast"        # Quick translation, may sacrifice some accuracy
@@ -24,6 +110,20 @@ class ContextAwareTranslator:
         self.project_id = settings.vertex_project_id
         self.chunker = TranscriptChunker()
         
+        # Regions tried in order; a region that has not answered within hedge_delay
+        # seconds is backed up by another region, up to hedge_regions at once
+        self.regions = ["us-central1", "us-east1", "us-west1", "europe-west4"]
+        self.hedge_regions = settings.translation_hedge_regions
+        self.hedge_delay = settings.translation_hedge_delay_seconds
+        
+        # Chunk batching limits: chunks per request, and characters per request
+        # so the translated batch stays within max_output_tokens
+        self.max_batch_size = 64
+        self.max_batch_chars = 12000
+        
+        # Batches translated in parallel for long scripts
+        self.max_concurrent_batches = 8
+        
         # Context-specific instruction templates
         self.context_instructions = {
             TranslationContext.SPIRITUAL: {
@@ -62,6 +162,13 @@ class ContextAwareTranslator:
                 "tone": "Natural, friendly, and conversational"
             }
         }
+        
+        # Static prompt prefixes, built once per (context, quality)
+        self._prefix_cache = {
+            (context, quality): self._build_prompt_prefix(context, quality)
+            for context in self.context_instructions
+            for quality in TranslationQuality
+        }
     
     def translate_script(self, 
                         script_text: str, 
@@ -109,35 +216,50 @@ class ContextAwareTranslator:
         """Handle translation of long scripts using chunking."""
         print(Colors.YELLOW + f"📑 Hosszú script észlelve ({len(script_text)} karakter)" + Colors.ENDC)
         
-        chunks = self.chunker.chunk_text(script_text)
-        print(Colors.CYAN + f"   ├─ {len(chunks)} chunk létrehozva translation-höz" + Colors.ENDC)
+        chunk_count = 0
+        batch_sizes = []
+        batch_results = []
         
-        translated_chunks = []
-        total_cost = 0.0
-        total_time = 0.0
-        
-        for i, (chunk_text, start_pos, end_pos) in enumerate(chunks):
-            print(Colors.CYAN + f"   ├─ Translation chunk {i+1}/{len(chunks)} ({len(chunk_text)} kar.)" + Colors.ENDC)
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_batches) as executor:
+            # Chunks are cut, batched and submitted in one pass as the chunker yields them;
+            # results are slotted back by index to keep script order
+            future_to_index = {}
+            chunk_texts = (chunk_text for chunk_text, _, _ in self.chunker.iter_chunks(script_text))
             
-            result = self._translate_single_chunk_internal(
-                chunk_text, target_language, context, audience, tone, quality, preserve_timing
-            )
+            for i, batch in enumerate(self._iter_batches(chunk_texts)):
+                future = executor.submit(
+                    self._translate_batch,
+                    batch, target_language, context, audience, tone, quality, preserve_timing
+                )
+                future_to_index[future] = i
+                batch_sizes.append(len(batch))
+                batch_results.append(None)
+                chunk_count += len(batch)
             
-            if result is None:
-                print(Colors.WARNING + f"   ✗ Chunk {i+1} translation sikertelen" + Colors.ENDC)
-                return None
-                
-            translated_chunks.append(result['translated_text'])
-            total_cost += result.get('estimated_cost', 0.0)
-            total_time += result.get('processing_time', 0.0)
+            print(Colors.CYAN + f"   ├─ {chunk_count} chunk, {len(batch_sizes)} translation batch (API hívás)" + Colors.ENDC)
             
-            print(Colors.GREEN + f"   ✓ Chunk {i+1} lefordítva" + Colors.ENDC)
+            for future in as_completed(future_to_index):
+                index = future_to_index[future]
+                result = future.result()
+                
+                if result is None:
+                    print(Colors.WARNING + f"   ✗ Batch {index + 1} translation sikertelen" + Colors.ENDC)
+                    for pending in future_to_index:
+                        pending.cancel()
+                    return None
+                
+                batch_results[index] = result
+                print(Colors.GREEN + f"   ✓ Batch {index + 1}/{len(batch_sizes)} lefordítva ({batch_sizes[index]} chunk)" + Colors.ENDC)
+        
+        translated_chunks = [chunk for result in batch_results for chunk in result['translated_chunks']]
+        total_cost = sum(result.get('estimated_cost', 0.0) for result in batch_results)
+        total_time = sum(result.get('processing_time', 0.0) for result in batch_results)
         
         # Merge translated chunks
         print(Colors.CYAN + "   ├─ Translation chunk-ok egyesítése..." + Colors.ENDC)
-        merged_translation = self._merge_translated_chunks(translated_chunks, chunks)
+        merged_translation = self._merge_translated_chunks(translated_chunks)
         
-        print(Colors.GREEN + f"   ✓ Chunked translation kész: {len(chunks)} chunk összevonva" + Colors.ENDC)
+        print(Colors.GREEN + f"   ✓ Chunked translation kész: {chunk_count} chunk összevonva" + Colors.ENDC)
         
         return {
             'translated_text': merged_translation,
@@ -148,15 +270,110 @@ class ContextAwareTranslator:
             'word_count': len(merged_translation.split()),
             'estimated_cost': total_cost,
             'processing_time': total_time,
-            'chunks_processed': len(chunks),
+            'chunks_processed': chunk_count,
+            'batches_processed': len(batch_sizes),
             'method': 'chunked'
         }
     
+    def _iter_batches(self, chunk_texts: Iterable[str]) -> Iterator[List[str]]:
+        """Group consecutive chunks into batches that fit a single API request."""
+        current_batch = []
+        current_chars = 0
+        
+        for chunk_text in chunk_texts:
+            if current_batch and (len(current_batch) >= self.max_batch_size or
+                                  current_chars + len(chunk_text) > self.max_batch_chars):
+                yield current_batch
+                current_batch = []
+                current_chars = 0
+            
+            current_batch.append(chunk_text)
+            current_chars += len(chunk_text)
+        
+        if current_batch:
+            yield current_batch
+    
+    def _translate_batch(self, chunk_texts: List[str], target_language: str,
+                         context: str, audience: str, tone: str,
+                         quality: TranslationQuality, preserve_timing: bool) -> Optional[Dict]:
+        """
+        Translate several chunks with a single model request.
+        
+        Chunks already in the translation cache are skipped. The rest are joined
+        with numbered section markers and the response is split back on them. If
+        the model drops or reorders markers, the batch falls back to one request
+        per chunk.
+        """
+        cache_keys = [
+            self._translation_cache_key(chunk_text, target_language, context, audience, tone, quality, preserve_timing)
+            for chunk_text in chunk_texts
+        ]
+        translated_chunks = [_translation_cache_get(key) for key in cache_keys]
+        missing = [i for i, translated in enumerate(translated_chunks) if translated is None]
+        total_cost = 0.0
+        total_time = 0.0
+        
+        if len(missing) > 1:
+            batch_text = '\n'.join(
+                f"{self._batch_marker(n)}\n{chunk_texts[i]}" for n, i in enumerate(missing)
+            )
+            
+            result = self._translate_single_chunk_internal(
+                batch_text, target_language, context, audience, tone, quality, preserve_timing
+            )
+            
+            if result is not None:
+                split_chunks = self._split_batch_response(result['translated_text'], len(missing))
+                if split_chunks is not None:
+                    for i, translated in zip(missing, split_chunks):
+                        translated_chunks[i] = translated
+                        _translation_cache_put(cache_keys[i], translated)
+                    
+                    return {
+                        'translated_chunks': translated_chunks,
+                        'estimated_cost': result.get('estimated_cost', 0.0),
+                        'processing_time': result.get('processing_time', 0.0)
+                    }
+            
+            print(Colors.WARNING + "   ⚠ Batch válasz nem bontható, chunkonkénti fordítás..." + Colors.ENDC)
+        
+        for i in missing:
+            result = self._translate_chunk_cached(
+                chunk_texts[i], target_language, context, audience, tone, quality, preserve_timing
+            )
+            if result is None:
+                return None
+            
+            translated_chunks[i] = result['translated_text']
+            total_cost += result.get('estimated_cost', 0.0)
+            total_time += result.get('processing_time', 0.0)
+        
+        return {
+            'translated_chunks': translated_chunks,
+            'estimated_cost': total_cost,
+            'processing_time': total_time
+        }
+    
+    def _batch_marker(self, index: int) -> str:
+        """Section marker separating chunks inside a batched request."""
+        return f"<<<CHUNK {index + 1}>>>"
+    
+    def _split_batch_response(self, translated_text: str, expected_chunks: int) -> Optional[List[str]]:
+        """Split a batched translation on its section markers, or None if they don't line up."""
+        parts = _BATCH_MARKER_RE.split(translated_text)
+        
+        # re.split with one capture group yields [preamble, n1, text1, n2, text2, ...]
+        numbers = [int(n) for n in parts[1::2]]
+        if numbers != list(range(1, expected_chunks + 1)):
+            return None
+        
+        return [text.strip() for text in parts[2::2]]
+    
     def _translate_single_chunk(self, script_text: str, target_language: str,
                               context: str, audience: str, tone: str,
                               quality: TranslationQuality, preserve_timing: bool) -> Optional[Dict]:
         """Handle translation of single chunk scripts."""
-        result = self._translate_single_chunk_internal(
+        result = self._translate_chunk_cached(
             script_text, target_language, context, audience, tone, quality, preserve_timing
         )
         
@@ -165,6 +382,46 @@ class ContextAwareTranslator:
             
         return result
     
+    def _translate_chunk_cached(self, chunk_text: str, target_language: str,
+                                context: str, audience: str, tone: str,
+                                quality: TranslationQuality, preserve_timing: bool) -> Optional[Dict]:
+        """Translate one chunk, reusing an earlier translation of identical text and settings."""
+        cache_key = self._translation_cache_key(
+            chunk_text, target_language, context, audience, tone, quality, preserve_timing
+        )
+        cached = _translation_cache_get(cache_key)
+        
+        if cached is not None:
+            return {
+                'translated_text': cached,
+                'original_text': chunk_text,
+                'source_language': 'hu-HU',
+                'target_language': target_language,
+                'translation_context': context,
+                'word_count': len(cached.split()),
+                'estimated_cost': 0.0,
+                'processing_time': 0.0,
+                'model_used': 'cache',
+                'region_used': None
+            }
+        
+        result = self._translate_single_chunk_internal(
+            chunk_text, target_language, context, audience, tone, quality, preserve_timing
+        )
+        
+        if result is not None:
+            _translation_cache_put(cache_key, result['translated_text'])
+        
+        return result
+    
+    @staticmethod
+    def _translation_cache_key(chunk_text: str, target_language: str, context: str,
+                               audience: str, tone: str, quality: TranslationQuality,
+                               preserve_timing: bool) -> Tuple:
+        """Cache key: content hash of the chunk plus every setting that shapes the prompt."""
+        digest = hashlib.blake2b(chunk_text.encode('utf-8'), digest_size=16).digest()
+        return (digest, target_language, context, audience, tone, quality, preserve_timing)
+    
     def _translate_single_chunk_internal(self, chunk_text: str, target_language: str,
                                        context: str, audience: str, tone: str,
                                        quality: TranslationQuality, preserve_timing: bool) -> Optional[Dict]:
@@ -172,55 +429,35 @@ class ContextAwareTranslator:
         start_time = datetime.datetime.now()
         
         try:
-            import vertexai
-            from vertexai.generative_models import GenerativeModel, GenerationConfig
+            import vertexai  # noqa: F401 - fail fast if the SDK is missing
             
             # Build context-aware prompt
             prompt = self._build_translation_prompt(
                 chunk_text, target_language, context, audience, tone, quality, preserve_timing
             )
             
-            # Get model combinations to try
+            # Get model combinations to try: every model in a region before the next region
             models_to_try = VertexAIModels.get_auto_detect_order()
-            regions = ["us-central1", "us-east1", "us-west1", "europe-west4"]
+            attempts = [(region, model_name) for region in self.regions for model_name in models_to_try]
             
-            for region in regions:
-                for model_name in models_to_try:
-                    try:
-                        # Initialize Vertex AI
-                        vertexai.init(project=self.project_id, location=region)
-                        model = GenerativeModel(model_name)
-                        
-                        # Configure generation parameters based on quality
-                        generation_config = self._get_generation_config(quality)
-                        
-                        # Generate translation
-                        response = model.generate_content(prompt, generation_config=generation_config)
-                        translated_text = response.text.strip()
-                        
-                        # Validate translation
-                        if self._validate_translation(chunk_text, translated_text, preserve_timing):
-                            processing_time = (datetime.datetime.now() - start_time).total_seconds()
-                            
-                            return {
-                                'translated_text': translated_text,
-                                'original_text': chunk_text,
-                                'source_language': 'hu-HU',
-                                'target_language': target_language,
-                                'translation_context': context,
-                                'word_count': len(translated_text.split()),
-                                'estimated_cost': self._estimate_translation_cost(chunk_text),
-                                'processing_time': processing_time,
-                                'model_used': model_name,
-                                'region_used': region
-                            }
-                        else:
-                            print(Colors.WARNING + f"   ⚠ Translation validation failed for {model_name}@{region}" + Colors.ENDC)
-                            continue
-                            
-                    except Exception as e:
-                        print(Colors.WARNING + f"   ✗ {model_name}@{region}: {str(e)[:100]}..." + Colors.ENDC)
-                        continue
+            winner = self._run_attempts(attempts, prompt, chunk_text, quality, preserve_timing)
+            
+            if winner is not None:
+                translated_text, region, model_name = winner
+                processing_time = (datetime.datetime.now() - start_time).total_seconds()
+                
+                return {
+                    'translated_text': translated_text,
+                    'original_text': chunk_text,
+                    'source_language': 'hu-HU',
+                    'target_language': target_language,
+                    'translation_context': context,
+                    'word_count': len(translated_text.split()),
+                    'estimated_cost': self._estimate_translation_cost(chunk_text),
+                    'processing_time': processing_time,
+                    'model_used': model_name,
+                    'region_used': region
+                }
             
             raise Exception("Nem sikerült egyetlen modellel sem lefordítani a szöveget")
             
@@ -231,21 +468,134 @@ class ContextAwareTranslator:
             print(Colors.FAIL + f"✗ Translation hiba: {e}" + Colors.ENDC)
             return None
     
+    def _run_attempts(self, attempts: List[Tuple[str, str]], prompt: str, chunk_text: str,
+                      quality: TranslationQuality, preserve_timing: bool) -> Optional[Tuple[str, str, str]]:
+        """
+        Try (region, model) attempts in order until a response passes validation.
+        
+        The next attempt starts when one fails. With hedge_regions > 1, a backup
+        request also goes to the next attempt in a region not already in flight
+        when nothing has answered within hedge_delay seconds, so a second billed
+        request is only sent for a slow region.
+        
+        Returns (translated_text, region, model_name), or None if every attempt failed.
+        """
+        remaining = deque(attempts)
+        future_to_attempt = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, self.hedge_regions))
+        
+        def start(pending, attempt):
+            remaining.remove(attempt)
+            region, model_name = attempt
+            future = executor.submit(self._call_region, region, model_name, prompt, quality)
+            future_to_attempt[future] = attempt
+            pending.add(future)
+        
+        def hedge_candidate(pending):
+            if len(pending) >= self.hedge_regions:
+                return None
+            busy_regions = {future_to_attempt[future][0] for future in pending}
+            return next((attempt for attempt in remaining if attempt[0] not in busy_regions), None)
+        
+        try:
+            pending = set()
+            if remaining:
+                start(pending, remaining[0])
+            
+            while pending:
+                hedge = hedge_candidate(pending)
+                done, pending = wait(
+                    pending, timeout=self.hedge_delay if hedge else None, return_when=FIRST_COMPLETED
+                )
+                
+                if not done:
+                    print(Colors.WARNING + f"   ⏱ Nincs válasz {self.hedge_delay:g}s alatt, tartalék kérés: {hedge[1]}@{hedge[0]}" + Colors.ENDC)
+                    start(pending, hedge)
+                    continue
+                
+                for future in done:
+                    region, model_name = future_to_attempt[future]
+                    try:
+                        translated_text = future.result()
+                    except Exception as e:
+                        print(Colors.WARNING + f"   ✗ {model_name}@{region}: {str(e)[:100]}..." + Colors.ENDC)
+                    else:
+                        if self._validate_translation(chunk_text, translated_text, preserve_timing):
+                            return translated_text, region, model_name
+                        
+                        print(Colors.WARNING + f"   ⚠ Translation validation failed for {model_name}@{region}" + Colors.ENDC)
+                    
+                    if remaining:
+                        start(pending, remaining[0])
+            
+            return None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _call_region(self, region: str, model_name: str, prompt: str,
+                     quality: TranslationQuality) -> str:
+        """Run one generate_content request against a model in a specific region."""
+        import vertexai
+        from vertexai.generative_models import GenerativeModel
+        
+        # vertexai.init sets process-wide state that GenerativeModel reads on construction
+        with _VERTEX_INIT_LOCK:
+            vertexai.init(project=self.project_id, location=region)
+            model = GenerativeModel(model_name)
+        
+        response = model.generate_content(prompt, generation_config=self._get_generation_config(quality))
+        return response.text.strip()
+    
     def _build_translation_prompt(self, script_text: str, target_language: str,
                                 context: str, audience: str, tone: str,
                                 quality: TranslationQuality, preserve_timing: bool) -> str:
         """Build context-aware translation prompt."""
+        return self._build_context_prompt(
+            script_text, context, target_language, audience, tone, quality
+        )
+    
+    def _build_context_prompt(self, script_text: str, context: str, target_language: str,
+                              audience: str, tone: str,
+                              quality: TranslationQuality = TranslationQuality.BALANCED) -> str:
+        """
+        Build the prompt from the cached per-context prefix and a short per-call suffix.
         
+        The prefix only depends on (context, quality), so repeated calls share an
+        identical leading block that Vertex AI can serve from its implicit cache.
+        """
+        prefix = self._prefix_cache.get((context, quality))
+        if prefix is None:
+            prefix = self._build_prompt_prefix(context, quality)
+        
+        header, footer = self._build_header(prefix, target_language, audience, tone)
+        return header + script_text + footer
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _build_header(prefix: str, target_language: str, audience: str, tone: str) -> Tuple[str, str]:
+        """Render the text placed before and after the script for one prefix/language/audience/tone."""
+        header = prefix + _PROMPT_HEADER_TEMPLATE.format(
+            target_language=target_language, audience=audience, tone=tone
+        )
+        footer = _PROMPT_FOOTER_TEMPLATE.format(target_language_upper=target_language.upper())
+        return header, footer
+    
+    def _build_prompt_prefix(self, context: str, quality: TranslationQuality) -> str:
+        """Build the static part of the prompt: context instructions, timing rules and quality."""
         context_info = self.context_instructions.get(context, self.context_instructions[TranslationContext.CASUAL])
         
-        prompt = f"""Fordítsd le ezt a magyar nyelvű időzített scriptet {target_language} nyelvre.
+        quality_notes = {
+            TranslationQuality.FAST: '- Gyors fordítás, hatékonyság prioritás',
+            TranslationQuality.BALANCED: '- Kiegyensúlyozott sebesség és minőség',
+            TranslationQuality.HIGH: '- Magas minőség, pontosság prioritás'
+        }
+        
+        return f"""Fordítsd le a lent megadott magyar nyelvű időzített scriptet a megadott célnyelvre.
 
 KRITIKUS: Ez egy IDŐZÍTETT SCRIPT audio szintézishez. Az időzítés SZENT!
 
 FORDÍTÁSI KONTEXTUS:
 - Tartalom típusa: {context}
-- Célközönség: {audience}
-- Kívánt hangvétel: {tone}
 - Speciális utasítás: {context_info['instruction']}
 - Terminológia: {context_info['terminology']}
 - Hangulat: {context_info['tone']}
@@ -256,18 +606,11 @@ IDŐZÍTÉS MEGŐRZÉSI SZABÁLYOK:
 3. Ha a fordítás hosszabb, oszd fel a sorokat, de TARTSD meg az időbélyegeket.
 4. Ha a fordítás rövidebb, összevonhatsz szomszédos sorokat.
 5. Szünet jelölők megőrzése: [levegővétel] → [breath], [rövid szünet] → [short pause], [hosszú szünet] → [long pause], [TÉMAVÁLTÁS] → [TOPIC CHANGE]
+6. A <<<CHUNK N>>> szakaszjelölőket VÁLTOZATLANUL, saját sorukban hagyd meg (ha vannak).
 
 FORDÍTÁSI MINŐSÉG: {quality.value.upper()}
-{'- Gyors fordítás, hatékonyság prioritás' if quality == TranslationQuality.FAST else ''}
-{'- Kiegyensúlyozott sebesség és minőség' if quality == TranslationQuality.BALANCED else ''}
-{'- Magas minőség, pontosság prioritás' if quality == TranslationQuality.HIGH else ''}
-
-EREDETI MAGYAR SCRIPT:
-{script_text}
-
-LEFORDÍTOTT {target_language.upper()} SCRIPT:"""
-
-        return prompt
+{quality_notes[quality]}
+"""
     
     def _get_generation_config(self, quality: TranslationQuality) -> object:
         """Get generation configuration based on quality setting."""
@@ -296,6 +639,22 @@ LEFORDÍTOTT {target_language.upper()} SCRIPT:"""
             # Fallback if vertexai not available
             return None
     
+    @staticmethod
+    def _is_valid_timestamp(timestamp: str) -> bool:
+        """Check for an exact [HH:MM:SS] timestamp with minutes and seconds below 60."""
+        if not isinstance(timestamp, str) or len(timestamp) != 10:
+            return False
+        
+        encoded = timestamp.encode('utf-8')
+        if len(encoded) != 10:
+            return False
+        
+        lanes = int.from_bytes(encoded, 'little') ^ _TIMESTAMP_TEMPLATE
+        digits = lanes & ~_TIMESTAMP_SEPARATOR_MASK
+        out_of_range = ((digits + _TIMESTAMP_LIMIT_ADD) | digits) & _TIMESTAMP_HIGH_BITS
+        
+        return not (lanes & _TIMESTAMP_SEPARATOR_MASK) and not out_of_range
+    
     def _validate_translation(self, original: str, translated: str, preserve_timing: bool) -> bool:
         """Validate translation quality and timing preservation."""
         if not translated or len(translated.strip()) == 0:
@@ -329,7 +688,7 @@ LEFORDÍTOTT {target_language.upper()} SCRIPT:"""
         return True
     
     def _merge_translated_chunks(self, translated_chunks: List[str], 
-                               chunk_info: List[Tuple[str, int, int]]) -> str:
+                               chunk_info: Optional[List[Tuple[str, int, int]]] = None) -> str:
         """Merge translated chunks back into single script."""
         if not translated_chunks:
             return ""
@@ -337,18 +696,25 @@ LEFORDÍTOTT {target_language.upper()} SCRIPT:"""
         if len(translated_chunks) == 1:
             return translated_chunks[0]
         
-        merged_lines = []
+        merged = io.StringIO()
         
         for i, translated_chunk in enumerate(translated_chunks):
-            lines = [line.strip() for line in translated_chunk.split('\n') if line.strip()]
-            
-            # Add chunk separator for debugging (except first chunk)
-            if i > 0 and lines:
-                merged_lines.append(f"[--- Translation Chunk {i+1} continues ---]")
+            chunk_started = False
             
-            merged_lines.extend(lines)
+            for line in translated_chunk.split('\n'):
+                line = line.strip()
+                if not line:
+                    continue
+                
+                # Add chunk separator for debugging (except first chunk)
+                if not chunk_started and i > 0:
+                    merged.write(f"[--- Translation Chunk {i+1} continues ---]\n")
+                chunk_started = True
+                
+                merged.write(line)
+                merged.write('\n')
         
-        return '\n'.join(merged_lines)
+        return merged.getvalue().rstrip('\n')
     
     def _estimate_translation_cost(self, text: str) -> float:
         """Estimate translation cost based on text length."""
@@ -360,25 +726,4 @@ LEFORDÍTOTT {target_language.upper()} SCRIPT:"""
     
     def get_supported_languages(self) -> List[Dict[str, str]]:
         """Get list of supported target languages."""
-        return [
-            {"code": "en-US", "name": "English (US)", "native": "English"},
-            {"code": "en-GB", "name": "English (UK)", "native": "English"},
-            {"code": "de-DE", "name": "German", "native": "Deutsch"},
-            {"code": "fr-FR", "name": "French", "native": "Français"},
-            {"code": "es-ES", "name": "Spanish", "native": "Español"},
-            {"code": "it-IT", "name": "Italian", "native": "Italiano"},
-            {"code": "pt-PT", "name": "Portuguese", "native": "Português"},
-            {"code": "ru-RU", "name": "Russian", "native": "Русский"},
-            {"code": "zh-CN", "name": "Chinese (Simplified)", "native": "中文"},
-            {"code": "ja-JP", "name": "Japanese", "native": "日本語"},
-            {"code": "ko-KR", "name": "Korean", "native": "한국어"},
-            {"code": "ar-SA", "name": "Arabic", "native": "العربية"},
-            {"code": "hi-IN", "name": "Hindi", "native": "हिन्दी"},
-            {"code": "th-TH", "name": "Thai", "native": "ไทย"},
-            {"code": "tr-TR", "name": "Turkish", "native": "Türkçe"},
-            {"code": "pl-PL", "name": "Polish", "native": "Polski"},
-            {"code": "nl-NL", "name": "Dutch", "native": "Nederlands"},
-            {"code": "sv-SE", "name": "Swedish", "native": "Svenska"},
-            {"code": "da-DK", "name": "Danish", "native": "Dansk"},
-            {"code": "no-NO", "name": "Norwegian", "native": "Norsk"}
-        ]
\ No newline at end of file
+        return [dict(language) for language in _LANGUAGES]
\ No newline at end of file
@@ -1,16 +1,87 @@
 """Video muxing module for replacing audio tracks using FFmpeg."""
 
 import os
+import json
+import asyncio
+import time
+import hashlib
+import threading
 import subprocess
 import datetime
 import tempfile
-from typing import Optional, Dict, Tuple
+from contextlib import ExitStack
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple, Union
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..config import settings
 from ..utils.colors import Colors
 
 
+# ffprobe limits: bytes / microseconds read before stream parameters are settled
+_FFPROBE_PROBESIZE = '500000'
+_FFPROBE_ANALYZEDURATION = '500000'
+
+# Only the fields _parse_video_probe/_parse_audio_probe actually read
+_FFPROBE_ENTRIES = (
+    'format=duration,bit_rate'
+    ':stream=codec_type,codec_name,width,height,r_frame_rate,sample_rate,channels,bit_rate'
+)
+
+def _load_json(data) -> Dict:
+    """Parse ffprobe JSON output (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Source codecs NVDEC decodes on every NVENC-capable GPU generation; others
+# (e.g. VP9 on older cards) fall back to CPU decoding
+_CUDA_DECODABLE_CODECS = frozenset({'h264', 'hevc', 'mpeg2video'})
+
+# Video codec (yt-dlp vcodec prefix, --format-sort name) that stream-copies into
+# each output container, so the mux never has to re-encode the download
+_CONTAINER_VIDEO_CODECS = {
+    'mp4': ('avc1', 'h264'),
+    'webm': ('vp9', 'vp9'),
+}
+
+# Name prefixes of the temp files the muxer writes to temp_video_dir
+_TEMP_FILE_PREFIXES = ('video_', 'preview_', 'audio_trim_')
+
+# ffprobe results kept per muxer instance
+_INFO_CACHE_SIZE = 128
+
+# Persisted encoder probe results, reused across process launches
+# (settings.ffmpeg_caps_cache_file overrides the location)
+_ENCODER_CAPS_FILE = Path.home() / '.cache' / 'youtube-transcription' / 'ffmpeg_caps.json'
+
+# ffmpeg only writes real errors to stderr, so the success path has nothing to buffer
+_FFMPEG_QUIET = ('-hide_banner', '-loglevel', 'error', '-nostats')
+
+# Containers where -movflags +faststart moves the moov atom to the front
+_FASTSTART_FORMATS = ('mp4', 'mov', 'm4a')
+
+# Placeholder arguments in muxing command templates, swapped for real paths per call
+_VIDEO_SLOT = '{video}'
+_AUDIO_SLOT = '{audio}'
+_OUTPUT_SLOT = '{out}'
+
+# Audio codecs each output container can take as-is with '-c:a copy'
+_COPYABLE_AUDIO_CODECS = {
+    'mp4': ('aac',),
+    'mkv': ('aac', 'mp3', 'opus', 'vorbis', 'flac'),
+    'webm': ('opus', 'vorbis'),
+    'avi': ('mp3',),
+}
+
+
 class VideoMuxingError(Exception):
     """Raised when video muxing operations fail."""
     pass
@@ -19,6 +90,10 @@ class VideoMuxingError(Exception):
 class VideoMuxer:
     """FFmpeg-based video muxer for replacing audio tracks in videos."""
     
+    # Encoder capabilities shared by every instance (see _detect_encoders)
+    _ENCODER_CAPS: Optional[Dict] = None
+    _ENCODER_CAPS_LOCK = threading.Lock()
+    
     def __init__(self):
         self.temp_video_dir = settings.temp_video_dir
         self.video_format = settings.video_output_format
@@ -26,6 +101,20 @@ class VideoMuxer:
         
         # Ensure temp directory exists with proper permissions
         self._ensure_temp_directories()
+        
+        # Hardware H.264 encoder for the re-encode path (None -> libx264)
+        self._hw_encoder = self._detect_hw_encoder()
+        
+        # Per-instance ffprobe LRU caches keyed by (path, mtime_ns, size)
+        self._video_info_cache = OrderedDict()
+        self._audio_info_cache = OrderedDict()
+        self._info_cache_lock = threading.Lock()
+        
+        # Muxing argument lists keyed by (format, preserve_quality, copy_audio)
+        self._cmd_templates = self._build_cmd_templates()
+        
+        # Temp files created by this muxer (downloads, trims) that still need deleting
+        self._temp_files = []
     
     def _ensure_temp_directories(self):
         """Ensure temp directories exist with proper write permissions."""
@@ -54,12 +143,100 @@ class VideoMuxer:
         except Exception as e:
             raise VideoMuxingError(f"Failed to create temp directory {self.temp_video_dir}: {e}")
     
+    def _detect_hw_encoder(self) -> Optional[str]:
+        """Return 'h264_nvenc' if FFmpeg has NVENC and a usable GPU, otherwise None."""
+        return self._detect_encoders()['hw_encoder']
+    
+    @classmethod
+    def _detect_encoders(cls) -> Dict:
+        """Encoder capabilities, probed once per process and persisted per FFmpeg build."""
+        with cls._ENCODER_CAPS_LOCK:
+            if cls._ENCODER_CAPS is None:
+                cls._ENCODER_CAPS = cls._load_or_probe_encoders()
+            return cls._ENCODER_CAPS
+    
+    @classmethod
+    def _load_or_probe_encoders(cls) -> Dict:
+        """Read capabilities from the on-disk cache, probing FFmpeg on a miss."""
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-version'], capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.SubprocessError):
+            return {'hw_encoder': None}
+        if result.returncode != 0:
+            return {'hw_encoder': None}
+        
+        # Same FFmpeg build on a host with the same GPU visibility -> same answer
+        gpu_visible = os.path.exists('/dev/nvidiactl')
+        build_key = hashlib.blake2b(
+            f"{result.stdout}|{gpu_visible}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        
+        caps_file = Path(settings.ffmpeg_caps_cache_file or _ENCODER_CAPS_FILE)
+        
+        try:
+            cached = json.loads(caps_file.read_text(encoding='utf-8'))
+            if cached.get('build_key') == build_key and cached['caps']['hw_encoder']:
+                return cached['caps']
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            pass
+        
+        caps = {'hw_encoder': cls._probe_nvenc()}
+        
+        # Only a working encoder is persisted: a failed probe may be a driver that
+        # was not loaded yet, so it is repeated on the next launch
+        if not caps['hw_encoder']:
+            return caps
+        
+        try:
+            caps_file.parent.mkdir(parents=True, exist_ok=True)
+            caps_file.write_text(
+                json.dumps({'build_key': build_key, 'caps': caps}), encoding='utf-8'
+            )
+        except OSError:
+            pass
+        
+        return caps
+    
+    @staticmethod
+    def _probe_nvenc() -> Optional[str]:
+        """Check that FFmpeg lists h264_nvenc and can actually encode with it."""
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-encoders'],
+                capture_output=True, text=True, timeout=10
+            )
+            if result.returncode != 0 or 'h264_nvenc' not in result.stdout:
+                return None
+            
+            # The encoder is listed whenever FFmpeg was built with it; a one-frame
+            # test encode confirms that a GPU and driver are actually present
+            result = subprocess.run(
+                [
+                    'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                    '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+                    '-frames:v', '1', '-c:v', 'h264_nvenc', '-f', 'null', '-'
+                ],
+                capture_output=True, text=True, timeout=30
+            )
+            if result.returncode != 0:
+                return None
+            
+            print(Colors.CYAN + "   ✓ NVENC hardware encoder elérhető" + Colors.ENDC)
+            return 'h264_nvenc'
+            
+        except (OSError, subprocess.SubprocessError):
+            return None
+    
     def replace_audio_in_video(self, 
                              video_url: str,
                              audio_file_path: str, 
                              output_path: str,
                              preserve_video_quality: bool = True,
-                             target_format: str = "mp4") -> Dict:
+                             target_format: str = "mp4",
+                             preview_output_path: Optional[str] = None,
+                             preview_duration_seconds: int = 30) -> Dict:
         """
         Replace audio track in video with new synthesized audio.
         
@@ -69,6 +246,8 @@ class VideoMuxer:
             output_path: Path for final dubbed video
             preserve_video_quality: Whether to preserve original video quality
             target_format: Output video format
+            preview_output_path: Also write a short mp4 preview here (same ffmpeg run)
+            preview_duration_seconds: Length of that preview
             
         Returns:
             Dictionary with muxing result and metadata
@@ -76,69 +255,156 @@ class VideoMuxer:
         print(Colors.BLUE + f"\n🎬 Video muxing indítása..." + Colors.ENDC)
         start_time = datetime.datetime.now()
         
+        # Temp files registered here are removed on every exit path
+        with ExitStack() as cleanup:
+            try:
+                # Verify audio file exists
+                if not os.path.exists(audio_file_path):
+                    raise VideoMuxingError(f"Audio file not found: {audio_file_path}")
+                
+                if os.path.isfile(video_url):
+                    # Local video: nothing to download, so probe both files at once
+                    temp_video_path = video_url
+                    temp_size_before = os.path.getsize(temp_video_path)
+                    video_info, audio_info = self._get_info_batch(temp_video_path, audio_file_path)
+                else:
+                    # Probe the audio while the video downloads; the two are independent
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        audio_future = executor.submit(self._get_audio_info, audio_file_path)
+                        
+                        # Download video (video-only to save bandwidth)
+                        temp_video_path = self._download_video_only(video_url, target_format)
+                        if not temp_video_path or not os.path.exists(temp_video_path):
+                            raise VideoMuxingError("Failed to download video")
+                        cleanup.callback(self._remove_temp_file, temp_video_path)
+                        
+                        print(Colors.CYAN + f"   ├─ Video letöltve: {os.path.basename(temp_video_path)}" + Colors.ENDC)
+                        
+                        # Get video info - check temp file integrity before processing
+                        temp_size_before = os.path.getsize(temp_video_path)
+                        video_info = self._get_video_info(temp_video_path)
+                        audio_info = audio_future.result()
+                
+                # Length limit, checked on the info already probed (no extra ffprobe)
+                self._validate_video_length(video_info)
+                
+                print(Colors.CYAN + f"   ├─ Temp video size before processing: {temp_size_before // 1024 // 1024}MB" + Colors.ENDC)
+                
+                print(Colors.CYAN + f"   ├─ Video: {video_info['duration']:.1f}s, {video_info['resolution']}" + Colors.ENDC)
+                print(Colors.CYAN + f"   ├─ Audio: {audio_info['duration']:.1f}s, {audio_info['sample_rate']}Hz" + Colors.ENDC)
+                
+                # Double-check temp file still exists before muxing
+                temp_size_after_info = os.path.getsize(temp_video_path)
+                if temp_size_after_info != temp_size_before:
+                    print(Colors.WARNING + f"   ⚠ Temp video size changed! Before: {temp_size_before}MB → After: {temp_size_after_info}MB" + Colors.ENDC)
+                
+                # Check duration compatibility
+                self._validate_duration_compatibility(video_info, audio_info)
+                
+                # Perform muxing
+                if preview_output_path:
+                    # Full video and preview share one ffmpeg process
+                    final_result, preview_result = self.mux_multiple(
+                        temp_video_path, audio_file_path,
+                        [
+                            {
+                                'output_path': output_path,
+                                'target_format': target_format,
+                                'preserve_quality': preserve_video_quality
+                            },
+                            {
+                                'output_path': preview_output_path,
+                                'duration_seconds': preview_duration_seconds
+                            }
+                        ],
+                        audio_codec=audio_info['codec'],
+                        video_codec=video_info['codec']
+                    )
+                    preview_result['is_preview'] = True
+                    preview_result['preview_duration'] = preview_duration_seconds
+                    final_result['preview'] = preview_result
+                else:
+                    final_result = self._mux_video_audio(
+                        temp_video_path, audio_file_path, output_path,
+                        preserve_video_quality, target_format,
+                        audio_codec=audio_info['codec'],
+                        video_codec=video_info['codec']
+                    )
+                
+                processing_time = (datetime.datetime.now() - start_time).total_seconds()
+                
+                # Add metadata
+                final_result.update({
+                    'processing_time_seconds': processing_time,
+                    'original_video_duration': video_info['duration'],
+                    'audio_duration': audio_info['duration'],
+                    'video_source': video_url
+                })
+                
+                print(Colors.GREEN + f"   ✓ Video muxing kész: {final_result.get('file_size_bytes', 0) // 1024 // 1024}MB" + Colors.ENDC)
+                
+                return final_result
+                
+            except Exception as e:
+                print(Colors.FAIL + f"✗ Video muxing hiba: {e}" + Colors.ENDC)
+                raise VideoMuxingError(f"Video muxing failed: {e}")
+    
+    def _register_temp_file(self, path: str) -> str:
+        """Track a temp file created by this muxer so cleanup can find it."""
+        self._temp_files.append(path)
+        return path
+    
+    def _remove_temp_file(self, path: str) -> bool:
+        """Delete a tracked temp file with a single unlink (no existence check)."""
+        if path in self._temp_files:
+            self._temp_files.remove(path)
         try:
-            # Download video (video-only to save bandwidth)
-            temp_video_path = self._download_video_only(video_url)
-            if not temp_video_path or not os.path.exists(temp_video_path):
-                raise VideoMuxingError("Failed to download video")
-            
-            print(Colors.CYAN + f"   ├─ Video letöltve: {os.path.basename(temp_video_path)}" + Colors.ENDC)
-            
-            # Verify audio file exists
-            if not os.path.exists(audio_file_path):
-                raise VideoMuxingError(f"Audio file not found: {audio_file_path}")
-            
-            # Get video info - check temp file integrity before processing
-            temp_size_before = os.path.getsize(temp_video_path)
-            print(Colors.CYAN + f"   ├─ Temp video size before processing: {temp_size_before // 1024 // 1024}MB" + Colors.ENDC)
-            
-            video_info = self._get_video_info(temp_video_path)
-            audio_info = self._get_audio_info(audio_file_path)
-            
-            print(Colors.CYAN + f"   ├─ Video: {video_info['duration']:.1f}s, {video_info['resolution']}" + Colors.ENDC)
-            print(Colors.CYAN + f"   ├─ Audio: {audio_info['duration']:.1f}s, {audio_info['sample_rate']}Hz" + Colors.ENDC)
-            
-            # Double-check temp file still exists before muxing
-            temp_size_after_info = os.path.getsize(temp_video_path)
-            if temp_size_after_info != temp_size_before:
-                print(Colors.WARNING + f"   ⚠ Temp video size changed! Before: {temp_size_before}MB → After: {temp_size_after_info}MB" + Colors.ENDC)
-            
-            # Check duration compatibility
-            self._validate_duration_compatibility(video_info, audio_info)
-            
-            # Perform muxing
-            final_result = self._mux_video_audio(
-                temp_video_path, audio_file_path, output_path,
-                preserve_video_quality, target_format
-            )
-            
-            processing_time = (datetime.datetime.now() - start_time).total_seconds()
-            
-            # Add metadata
-            final_result.update({
-                'processing_time_seconds': processing_time,
-                'original_video_duration': video_info['duration'],
-                'audio_duration': audio_info['duration'],
-                'video_source': video_url
-            })
-            
-            print(Colors.GREEN + f"   ✓ Video muxing kész: {final_result.get('file_size_bytes', 0) // 1024 // 1024}MB" + Colors.ENDC)
-            
-            return final_result
-            
-        except Exception as e:
-            print(Colors.FAIL + f"✗ Video muxing hiba: {e}" + Colors.ENDC)
-            raise VideoMuxingError(f"Video muxing failed: {e}")
-        finally:
-            # Cleanup temp video file
-            if 'temp_video_path' in locals() and os.path.exists(temp_video_path):
-                try:
-                    os.remove(temp_video_path)
-                    print(Colors.CYAN + "   └─ Temp video fájl törölve" + Colors.ENDC)
-                except:
-                    pass
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+    
+    def cleanup_temp_files(self) -> int:
+        """Delete every temp file this muxer created and still tracks."""
+        removed = 0
+        for path in self._temp_files:
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+        self._temp_files.clear()
+        return removed
     
-    def _download_video_only(self, video_url: str) -> str:
+    def cleanup_stale_temp_files(self, max_age_seconds: int = 24 * 3600) -> int:
+        """
+        Delete this muxer's temp files older than max_age_seconds.
+        
+        Only names the muxer creates itself are touched, since the temp video
+        directory may be shared. Meant for maintenance hooks such as API startup.
+        """
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        
+        try:
+            with os.scandir(self.temp_video_dir) as entries:
+                for entry in entries:
+                    try:
+                        if (entry.name.startswith(_TEMP_FILE_PREFIXES)
+                                and entry.is_file(follow_symlinks=False)
+                                and entry.stat(follow_symlinks=False).st_mtime < cutoff):
+                            os.unlink(entry.path)
+                            removed += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return 0
+        
+        if removed:
+            print(Colors.CYAN + f"   ✓ {removed} elavult temp fájl törölve: {self.temp_video_dir}" + Colors.ENDC)
+        return removed
+    
+    def _download_video_only(self, video_url: str, target_format: str = "mp4") -> str:
         """Download video stream only (no audio) to save bandwidth."""
         if os.path.isfile(video_url):
             # Local file path provided
@@ -158,10 +424,12 @@ class VideoMuxer:
             print(Colors.CYAN + f"   ├─ Downloading to: {temp_path}" + Colors.ENDC)
             
             # Use yt-dlp to download video-only stream with better format selection
-            # Priority: video-only mp4 > video-only any format > best overall with video
+            # Priority: video-only in the target's codec > video-only any codec > best overall
+            format_spec, format_sort = self._video_format_selection(target_format)
             cmd = [
                 'yt-dlp',
-                '--format', 'bv[ext=mp4][height<=720]/bv[height<=720]/best[height<=720]/bv/best',
+                '--format', format_spec,
+                '--format-sort', format_sort,
                 '--output', temp_path,
                 '--no-warnings',
                 '--no-playlist',
@@ -197,6 +465,7 @@ class VideoMuxer:
             
             if not downloaded_file:
                 raise VideoMuxingError("Downloaded video file not found")
+            self._register_temp_file(downloaded_file)
             
             # Validate the downloaded video file
             try:
@@ -204,10 +473,7 @@ class VideoMuxer:
                 return downloaded_file
             except Exception as e:
                 # Clean up invalid file
-                try:
-                    os.remove(downloaded_file)
-                except:
-                    pass
+                self._remove_temp_file(downloaded_file)
                 raise VideoMuxingError(f"Downloaded video file is invalid: {e}")
             
         except subprocess.TimeoutExpired:
@@ -217,30 +483,30 @@ class VideoMuxer:
         except Exception as e:
             raise VideoMuxingError(f"Video download error: {e}")
     
+    def _video_format_selection(self, target_format: str) -> Tuple[str, str]:
+        """Build yt-dlp --format / --format-sort values for a target container."""
+        fallback = 'bv[height<=720]/best[height<=720]/bv/best'
+        codec = _CONTAINER_VIDEO_CODECS.get(target_format)
+        if codec is None:
+            return f'bv[ext=mp4][height<=720]/{fallback}', 'res,fps,br'
+        
+        vcodec, sort_name = codec
+        format_spec = (
+            f'bv[vcodec^={vcodec}][ext={target_format}][height<=720]'
+            f'/bv[vcodec^={vcodec}][height<=720]/{fallback}'
+        )
+        return format_spec, f'res,fps,vcodec:{sort_name},br'
+    
     def _validate_video_file(self, video_path: str):
         """Validate that the video file contains a proper video stream."""
         try:
             # Quick validation using ffprobe
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-select_streams', 'v:0',
-                '-show_entries', 'stream=codec_name,width,height,duration',
-                '-of', 'csv=p=0',
-                video_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                raise VideoMuxingError(f"ffprobe validation failed: {result.stderr}")
+            parts = self._probe_csv(video_path, 'stream=codec_name,width,height', 'v:0')
             
             # Check if we got video stream info
-            output = result.stdout.strip()
-            if not output or output.count(',') < 2:
+            if len(parts) < 3:
                 raise VideoMuxingError("No valid video stream found in downloaded file")
             
-            parts = output.split(',')
             codec, width, height = parts[0], parts[1], parts[2]
             
             if not codec or not width or not height:
@@ -253,30 +519,141 @@ class VideoMuxer:
         except Exception as e:
             raise VideoMuxingError(f"Video validation failed: {e}")
     
+    def _file_cache_key(self, path: str) -> Optional[Tuple[str, int, int]]:
+        """Key identifying a file's current contents, or None if it can't be stat'ed."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    
+    def _info_cache_get(self, cache: OrderedDict, key: Optional[Tuple]) -> Optional[Dict]:
+        """Return a copy of a cached probe result, or None on a miss."""
+        if key is None:
+            return None
+        with self._info_cache_lock:
+            info = cache.get(key)
+            if info is None:
+                return None
+            cache.move_to_end(key)
+            return dict(info)
+    
+    def _info_cache_put(self, cache: OrderedDict, key: Optional[Tuple], info: Dict) -> None:
+        """Store a probe result, evicting the least recently used entry when full."""
+        if key is None:
+            return
+        with self._info_cache_lock:
+            cache[key] = dict(info)
+            cache.move_to_end(key)
+            if len(cache) > _INFO_CACHE_SIZE:
+                cache.popitem(last=False)
+    
     def _get_video_info(self, video_path: str) -> Dict:
-        """Get video file information using ffprobe."""
+        """Get video file information using ffprobe, cached while the file is unchanged."""
+        key = self._file_cache_key(video_path)
+        info = self._info_cache_get(self._video_info_cache, key)
+        if info is None:
+            info = self._probe_video_info(video_path)
+            self._info_cache_put(self._video_info_cache, key, info)
+        return info
+    
+    def _get_audio_info(self, audio_path: str) -> Dict:
+        """Get audio file information using ffprobe, cached while the file is unchanged."""
+        key = self._file_cache_key(audio_path)
+        info = self._info_cache_get(self._audio_info_cache, key)
+        if info is None:
+            info = self._probe_audio_info(audio_path)
+            self._info_cache_put(self._audio_info_cache, key, info)
+        return info
+    
+    def _probe_video_info(self, video_path: str) -> Dict:
+        """Run ffprobe for video information."""
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                video_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                stderr_msg = result.stderr or "No error details available"
+            result = subprocess.run(self._ffprobe_json_cmd(video_path), capture_output=True, text=True, timeout=30)
+        except Exception as e:
+            raise VideoMuxingError(f"Video info extraction failed: {e}")
+        
+        return self._parse_video_probe(video_path, result.returncode, result.stdout, result.stderr)
+    
+    def _probe_audio_info(self, audio_path: str) -> Dict:
+        """Run ffprobe for audio information."""
+        try:
+            result = subprocess.run(self._ffprobe_json_cmd(audio_path), capture_output=True, text=True, timeout=30)
+        except Exception as e:
+            raise VideoMuxingError(f"Audio info extraction failed: {e}")
+        
+        return self._parse_audio_probe(result.returncode, result.stdout, result.stderr)
+    
+    def _get_info_batch(self, video_path: str, audio_path: str) -> Tuple[Dict, Dict]:
+        """
+        Get video and audio info, running ffprobe on the uncached files side by side.
+        
+        Shares the caches of _get_video_info and _get_audio_info.
+        """
+        video_key = self._file_cache_key(video_path)
+        audio_key = self._file_cache_key(audio_path)
+        video_info = self._info_cache_get(self._video_info_cache, video_key)
+        audio_info = self._info_cache_get(self._audio_info_cache, audio_key)
+        
+        missing = [path for path, info in ((video_path, video_info), (audio_path, audio_info)) if info is None]
+        probes = iter(self._run_ffprobes(missing))
+        
+        if video_info is None:
+            video_info = self._parse_video_probe(video_path, *next(probes))
+            self._info_cache_put(self._video_info_cache, video_key, video_info)
+        if audio_info is None:
+            audio_info = self._parse_audio_probe(*next(probes))
+            self._info_cache_put(self._audio_info_cache, audio_key, audio_info)
+        
+        return video_info, audio_info
+    
+    def _run_ffprobes(self, paths: List[str]) -> List[Tuple[int, str, str]]:
+        """Run one JSON ffprobe per path concurrently; return (returncode, stdout, stderr) each."""
+        processes = []
+        try:
+            for path in paths:
+                processes.append(subprocess.Popen(
+                    self._ffprobe_json_cmd(path),
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+                ))
+            
+            outputs = [process.communicate(timeout=30) for process in processes]
+        except (OSError, subprocess.TimeoutExpired) as e:
+            for process in processes:
+                process.kill()
+                process.wait()  # Reap it so no zombie is left behind
+            raise VideoMuxingError(f"ffprobe failed: {e}")
+        
+        return [
+            (process.returncode, stdout, stderr)
+            for process, (stdout, stderr) in zip(processes, outputs)
+        ]
+    
+    def _ffprobe_json_cmd(self, path: str) -> list:
+        """Build the ffprobe command that dumps format and stream info as JSON."""
+        return [
+            'ffprobe',
+            '-v', 'quiet',
+            # Container headers carry everything we read; skip the default 5s stream analysis
+            '-probesize', _FFPROBE_PROBESIZE,
+            '-analyzeduration', _FFPROBE_ANALYZEDURATION,
+            '-print_format', 'json',
+            '-show_entries', _FFPROBE_ENTRIES,
+            path
+        ]
+    
+    def _parse_video_probe(self, video_path: str, returncode: int, stdout: str, stderr: str) -> Dict:
+        """Extract video information from ffprobe JSON output."""
+        try:
+            if returncode != 0:
+                stderr_msg = stderr or "No error details available"
                 print(Colors.WARNING + f"   ⚠ ffprobe error: {stderr_msg}" + Colors.ENDC)
                 raise VideoMuxingError(f"ffprobe failed: {stderr_msg}")
             
-            import json
             try:
-                probe_data = json.loads(result.stdout)
+                probe_data = _load_json(stdout)
             except json.JSONDecodeError as e:
-                print(Colors.WARNING + f"   ⚠ ffprobe output: {result.stdout[:200]}..." + Colors.ENDC)
+                print(Colors.WARNING + f"   ⚠ ffprobe output: {stdout[:200]}..." + Colors.ENDC)
                 raise VideoMuxingError(f"Failed to parse ffprobe JSON output: {e}")
             
             # Debug: Show all available streams
@@ -322,30 +699,16 @@ class VideoMuxer:
                 'fps': self._parse_framerate(video_stream.get('r_frame_rate', '0/0'))
             }
             
-        except json.JSONDecodeError:
-            raise VideoMuxingError("Failed to parse ffprobe output")
         except Exception as e:
             raise VideoMuxingError(f"Video info extraction failed: {e}")
     
-    def _get_audio_info(self, audio_path: str) -> Dict:
-        """Get audio file information using ffprobe."""
+    def _parse_audio_probe(self, returncode: int, stdout: str, stderr: str) -> Dict:
+        """Extract audio information from ffprobe JSON output."""
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                audio_path
-            ]
+            if returncode != 0:
+                raise VideoMuxingError(f"Audio ffprobe failed: {stderr}")
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                raise VideoMuxingError(f"Audio ffprobe failed: {result.stderr}")
-            
-            import json
-            probe_data = json.loads(result.stdout)
+            probe_data = _load_json(stdout)
             
             # Find audio stream
             audio_stream = None
@@ -370,8 +733,54 @@ class VideoMuxer:
         except Exception as e:
             raise VideoMuxingError(f"Audio info extraction failed: {e}")
     
-    def _validate_duration_compatibility(self, video_info: Dict, audio_info: Dict):
-        """Validate that video and audio durations are compatible."""
+    def _probe_csv(self, path: str, entries: str, select_streams: Optional[str] = None) -> List[str]:
+        """Read a few bare ffprobe values (csv, no keys/sections) from the first output row."""
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-probesize', _FFPROBE_PROBESIZE,
+            '-analyzeduration', _FFPROBE_ANALYZEDURATION,
+        ]
+        if select_streams:
+            cmd.extend(['-select_streams', select_streams])
+        cmd.extend(['-show_entries', entries, '-of', 'csv=p=0', path])
+        
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            raise VideoMuxingError(f"ffprobe failed: {result.stderr}")
+        return result.stdout.strip().split('\n', 1)[0].split(',')
+    
+    def _probe_duration(self, path: str) -> float:
+        """Read only the container duration (seconds)."""
+        try:
+            return float(self._probe_csv(path, 'format=duration')[0])
+        except Exception as e:
+            raise VideoMuxingError(f"Duration probe failed: {e}")
+    
+    def _validate_video_length(self, video: Union[str, Dict]) -> float:
+        """
+        Enforce the configured maximum video length.
+        
+        Args:
+            video: Video path (probed for duration only) or an already fetched info dict
+            
+        Returns:
+            Video duration in seconds
+        """
+        if isinstance(video, dict):
+            duration = video['duration']
+        else:
+            duration = self._probe_duration(video)
+        
+        max_minutes = settings.max_video_length_minutes
+        if duration > max_minutes * 60:
+            raise VideoMuxingError(
+                f"Video length {duration / 60:.1f} minutes exceeds the {max_minutes} minutes limit"
+            )
+        return duration
+    
+    def _validate_duration_compatibility(self, video_info: Dict, audio_info: Dict) -> bool:
+        """Check that video and audio durations are within 10% of each other; warns otherwise."""
         video_duration = video_info['duration']
         audio_duration = audio_info['duration']
         
@@ -389,10 +798,78 @@ class VideoMuxer:
             # If audio is much longer, we'll trim it
             if audio_duration > video_duration * 1.2:
                 print(Colors.WARNING + "   ⚠ Audio will be trimmed to match video" + Colors.ENDC)
+            
+            return False
+        
+        return True
     
     def _mux_video_audio(self, video_path: str, audio_path: str, output_path: str,
-                        preserve_quality: bool, target_format: str) -> Dict:
-        """Perform the actual video/audio muxing using FFmpeg."""
+                        preserve_quality: bool, target_format: str,
+                        audio_codec: Optional[str] = None,
+                        video_codec: Optional[str] = None,
+                        is_final: bool = True) -> Dict:
+        """Blocking wrapper around _mux_video_audio_async for synchronous callers."""
+        return self._run_blocking(self._mux_video_audio_async(
+            video_path, audio_path, output_path,
+            preserve_quality, target_format, audio_codec, video_codec, is_final
+        ))
+    
+    def _run_blocking(self, coro):
+        """Run a coroutine to completion from synchronous code."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        
+        # Called on an event-loop thread: run the mux on its own loop in a helper
+        # thread. This still blocks the caller's loop, so async callers should run
+        # the sync pipeline via asyncio.to_thread (as the API does) instead
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+    
+    async def _run_ffmpeg(self, cmd: list, stdin_data: Optional[bytes] = None) -> bytes:
+        """
+        Run ffmpeg without blocking the event loop; return stderr, raise on failure.
+        
+        stdin_data, if given, is written to ffmpeg's stdin (for a pipe:0 input).
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL if stdin_data is None else asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(
+                process.communicate(input=stdin_data),
+                timeout=1800  # 30 minutes max
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        
+        if process.returncode != 0:
+            stderr = stderr.decode('utf-8', errors='replace')
+            print(Colors.FAIL + f"   ✗ FFmpeg error: {stderr}" + Colors.ENDC)
+            raise VideoMuxingError(f"FFmpeg failed: {stderr}")
+        
+        return stderr
+    
+    async def _mux_video_audio_async(self, video_path: str, audio_path: str, output_path: str,
+                                     preserve_quality: bool, target_format: str,
+                                     audio_codec: Optional[str] = None,
+                                     video_codec: Optional[str] = None,
+                                     is_final: bool = True) -> Dict:
+        """
+        Perform the actual video/audio muxing using FFmpeg.
+        
+        audio_codec is the probed codec of audio_path; when the target container
+        accepts it, the audio stream is copied instead of re-encoded to AAC.
+        video_codec is the probed codec of video_path; it decides whether an
+        NVENC re-encode can also decode on the GPU.
+        is_final marks a deliverable; intermediates skip the faststart rewrite.
+        """
         print(Colors.CYAN + "   ├─ FFmpeg muxing futtatása..." + Colors.ENDC)
         
         try:
@@ -402,7 +879,7 @@ class VideoMuxer:
             # Build FFmpeg command
             cmd = self._build_ffmpeg_command(
                 video_path, audio_path, output_path, 
-                preserve_quality, target_format
+                preserve_quality, target_format, audio_codec, video_codec, is_final
             )
             
             # Final input validation before FFmpeg
@@ -418,76 +895,267 @@ class VideoMuxer:
             print(Colors.CYAN + f"   ├─ FFmpeg output: {output_path}" + Colors.ENDC)
             print(Colors.CYAN + f"   ├─ FFmpeg cmd: {' '.join(cmd[:8])}..." + Colors.ENDC)
             
-            # Run FFmpeg
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=1800  # 30 minutes max
+            # Run FFmpeg without blocking the event loop
+            stderr = await self._run_ffmpeg(cmd)
+            
+            return await asyncio.to_thread(
+                self._collect_mux_result, output_path, target_format, stderr
             )
             
-            if result.returncode != 0:
-                print(Colors.FAIL + f"   ✗ FFmpeg error: {result.stderr}" + Colors.ENDC)
-                raise VideoMuxingError(f"FFmpeg failed: {result.stderr}")
+        except asyncio.TimeoutError:
+            raise VideoMuxingError("FFmpeg timeout (30 minutes)")
+        except Exception as e:
+            raise VideoMuxingError(f"Muxing operation failed: {e}")
+    
+    def _mux_video_audio_from_bytes(self, video_path: str, audio_bytes: bytes, output_path: str,
+                                    preserve_quality: bool = True, target_format: str = "mp4",
+                                    audio_codec: Optional[str] = None,
+                                    video_codec: Optional[str] = None,
+                                    is_final: bool = True) -> Dict:
+        """Blocking wrapper around _mux_video_audio_from_bytes_async for synchronous callers."""
+        return self._run_blocking(self._mux_video_audio_from_bytes_async(
+            video_path, audio_bytes, output_path,
+            preserve_quality, target_format, audio_codec, video_codec, is_final
+        ))
+    
+    async def _mux_video_audio_from_bytes_async(self, video_path: str, audio_bytes: bytes, output_path: str,
+                                                preserve_quality: bool = True, target_format: str = "mp4",
+                                                audio_codec: Optional[str] = None,
+                                                video_codec: Optional[str] = None,
+                                                is_final: bool = True) -> Dict:
+        """
+        Mux in-memory audio into a video, streaming it to ffmpeg over stdin.
+        
+        Audio the caller already holds in memory is not written to disk just so
+        ffmpeg can read it back.
+        """
+        print(Colors.CYAN + "   ├─ FFmpeg muxing futtatása (audio stdin-ről)..." + Colors.ENDC)
+        
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # Verify output file was created
-            if not os.path.exists(output_path):
-                raise VideoMuxingError("Output file was not created")
+            if not os.path.exists(video_path):
+                raise VideoMuxingError(f"Video input missing before FFmpeg: {video_path}")
+            if not audio_bytes:
+                raise VideoMuxingError("Audio input is empty")
             
-            # Check output file size before trying to extract info
-            output_size = os.path.getsize(output_path)
-            if output_size == 0:
-                print(Colors.FAIL + f"   ✗ FFmpeg created empty output file" + Colors.ENDC)
-                print(Colors.FAIL + f"   ✗ FFmpeg stdout: {result.stdout}" + Colors.ENDC)
-                print(Colors.FAIL + f"   ✗ FFmpeg stderr: {result.stderr}" + Colors.ENDC)
-                raise VideoMuxingError("FFmpeg created empty output file")
+            cmd = self._build_ffmpeg_command(
+                video_path, 'pipe:0', output_path,
+                preserve_quality, target_format, audio_codec, video_codec, is_final
+            )
             
-            print(Colors.CYAN + f"   ✓ Output file created: {output_size // 1024 // 1024}MB" + Colors.ENDC)
+            stderr = await self._run_ffmpeg(cmd, stdin_data=audio_bytes)
             
-            # Get output file info
-            output_info = self._get_video_info(output_path)
-            file_size = os.path.getsize(output_path)
+            return await asyncio.to_thread(
+                self._collect_mux_result, output_path, target_format, stderr
+            )
             
-            return {
-                'video_file_path': output_path,
-                'final_video_duration': output_info['duration'],
-                'file_size_bytes': file_size,
-                'format': target_format,
-                'resolution': output_info['resolution'],
-                'video_codec': output_info['codec'],
-                'success': True
-            }
+        except asyncio.TimeoutError:
+            raise VideoMuxingError("FFmpeg timeout (30 minutes)")
+        except Exception as e:
+            raise VideoMuxingError(f"Muxing operation failed: {e}")
+    
+    def mux_multiple(self, video_path: str, audio_path: str, outputs: List[Dict],
+                     audio_codec: Optional[str] = None,
+                     video_codec: Optional[str] = None) -> List[Dict]:
+        """
+        Write several muxed outputs from one video/audio pair in a single ffmpeg run.
+        
+        Args:
+            video_path: Video input
+            audio_path: Audio input
+            outputs: One dict per output with 'output_path' and optionally
+                'target_format' (default mp4), 'preserve_quality' (default True),
+                'duration_seconds' (cut the output to this length) and
+                'is_final' (default True; False skips the faststart rewrite)
+            audio_codec: Probed codec of audio_path (enables audio stream copy)
+            video_codec: Probed codec of video_path
             
-        except subprocess.TimeoutExpired:
+        Returns:
+            One muxing result per output, in the same order
+        """
+        return self._run_blocking(
+            self._mux_multiple_async(video_path, audio_path, outputs, audio_codec, video_codec)
+        )
+    
+    async def _mux_multiple_async(self, video_path: str, audio_path: str, outputs: List[Dict],
+                                  audio_codec: Optional[str] = None,
+                                  video_codec: Optional[str] = None) -> List[Dict]:
+        """Build and run the multi-output ffmpeg command behind mux_multiple."""
+        print(Colors.CYAN + f"   ├─ FFmpeg muxing futtatása ({len(outputs)} kimenet)..." + Colors.ENDC)
+        
+        try:
+            if not outputs:
+                raise VideoMuxingError("No outputs requested")
+            if not os.path.exists(video_path):
+                raise VideoMuxingError(f"Video input missing before FFmpeg: {video_path}")
+            if not os.path.exists(audio_path):
+                raise VideoMuxingError(f"Audio input missing before FFmpeg: {audio_path}")
+            
+            # Inputs are decoded once for all outputs, so GPU decoding is used as
+            # soon as any output re-encodes on NVENC
+            gpu_decode = any(
+                self._use_gpu_decode(output.get('preserve_quality', True), video_codec)
+                for output in outputs
+            )
+            slots = {_VIDEO_SLOT: video_path, _AUDIO_SLOT: audio_path}
+            cmd = [slots.get(arg, arg) for arg in self._input_template(gpu_decode)]
+            
+            for output in outputs:
+                output_path = output['output_path']
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                
+                if output.get('duration_seconds'):
+                    cmd.extend(['-t', str(output['duration_seconds'])])
+                
+                template = self._output_template(
+                    output.get('preserve_quality', True),
+                    output.get('target_format', 'mp4'),
+                    audio_codec,
+                    output.get('is_final', True)
+                )
+                cmd.extend(output_path if arg == _OUTPUT_SLOT else arg for arg in template)
+            
+            stderr = await self._run_ffmpeg(cmd)
+            
+            return [
+                await asyncio.to_thread(
+                    self._collect_mux_result,
+                    output['output_path'], output.get('target_format', 'mp4'), stderr
+                )
+                for output in outputs
+            ]
+            
+        except asyncio.TimeoutError:
             raise VideoMuxingError("FFmpeg timeout (30 minutes)")
         except Exception as e:
             raise VideoMuxingError(f"Muxing operation failed: {e}")
     
+    def _collect_mux_result(self, output_path: str, target_format: str,
+                            stderr: bytes = b'') -> Dict:
+        """Verify the ffmpeg output file and build the muxing result."""
+        # Verify output file was created
+        if not os.path.exists(output_path):
+            raise VideoMuxingError("Output file was not created")
+        
+        # Check output file size before trying to extract info
+        output_size = os.path.getsize(output_path)
+        if output_size == 0:
+            print(Colors.FAIL + f"   ✗ FFmpeg created empty output file" + Colors.ENDC)
+            print(Colors.FAIL + f"   ✗ FFmpeg stderr: {stderr.decode('utf-8', errors='replace')}" + Colors.ENDC)
+            raise VideoMuxingError("FFmpeg created empty output file")
+        
+        print(Colors.CYAN + f"   ✓ Output file created: {output_size // 1024 // 1024}MB" + Colors.ENDC)
+        
+        # Get output file info
+        output_info = self._get_video_info(output_path)
+        file_size = os.path.getsize(output_path)
+        
+        return {
+            'video_file_path': output_path,
+            'final_video_duration': output_info['duration'],
+            'file_size_bytes': file_size,
+            'format': target_format,
+            'resolution': output_info['resolution'],
+            'video_codec': output_info['codec'],
+            'success': True
+        }
+    
     def _build_ffmpeg_command(self, video_path: str, audio_path: str, output_path: str,
-                            preserve_quality: bool, target_format: str) -> list:
+                            preserve_quality: bool, target_format: str,
+                            audio_codec: Optional[str] = None,
+                            video_codec: Optional[str] = None,
+                            is_final: bool = True) -> list:
         """Build FFmpeg command for video/audio muxing."""
+        template = (
+            self._input_template(self._use_gpu_decode(preserve_quality, video_codec))
+            + self._output_template(preserve_quality, target_format, audio_codec, is_final)
+        )
         
+        slots = {_VIDEO_SLOT: video_path, _AUDIO_SLOT: audio_path, _OUTPUT_SLOT: output_path}
+        return [slots.get(arg, arg) for arg in template]
+    
+    def _use_gpu_decode(self, preserve_quality: bool, video_codec: Optional[str]) -> bool:
+        """Decode on the GPU only when NVENC re-encodes a codec NVDEC can read."""
+        return (
+            not preserve_quality
+            and self._hw_encoder is not None
+            and video_codec in _CUDA_DECODABLE_CODECS
+        )
+    
+    @staticmethod
+    def _input_template(gpu_decode: bool) -> tuple:
+        """Global options and the two inputs, shared by every output of a command."""
         cmd = [
             'ffmpeg',
+            *_FFMPEG_QUIET,
+            '-nostdin',  # Never wait on a tty
             '-y',  # Overwrite output file
-            '-i', video_path,  # Video input
-            '-i', audio_path,  # Audio input
         ]
         
+        if gpu_decode:
+            # Decode with NVDEC and keep frames in VRAM for NVENC (no PCIe round-trip)
+            cmd.extend(['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'])
+        
+        cmd.extend([
+            '-i', _VIDEO_SLOT,  # Video input
+            '-i', _AUDIO_SLOT,  # Audio input
+        ])
+        
+        return tuple(cmd)
+    
+    def _output_template(self, preserve_quality: bool, target_format: str,
+                         audio_codec: Optional[str] = None, is_final: bool = True) -> tuple:
+        """Per-output options for one target, composed once per settings combination."""
+        copy_audio = audio_codec in _COPYABLE_AUDIO_CODECS.get(target_format, ())
+        key = (target_format, preserve_quality, copy_audio, is_final)
+        
+        template = self._cmd_templates.get(key)
+        if template is None:
+            template = self._compose_output_template(
+                preserve_quality, target_format, copy_audio, is_final
+            )
+            self._cmd_templates[key] = template
+        
+        return template
+    
+    def _build_cmd_templates(self) -> Dict[Tuple[str, bool, bool, bool], tuple]:
+        """Pre-build per-output templates for every supported output format."""
+        # Intermediate-output variants are composed on first use
+        return {
+            (fmt['format'], preserve_quality, copy_audio, True):
+                self._compose_output_template(preserve_quality, fmt['format'], copy_audio)
+            for fmt in self.get_supported_formats()
+            for preserve_quality in (True, False)
+            for copy_audio in (True, False)
+        }
+    
+    def _compose_output_template(self, preserve_quality: bool, target_format: str,
+                                 copy_audio: bool, is_final: bool = True) -> tuple:
+        """Compose one output's codec, mapping and container options, ending in its path slot."""
+        cmd = []
+        
         if preserve_quality:
             # Copy video stream without re-encoding
             cmd.extend(['-c:v', 'copy'])
+        elif self._hw_encoder:
+            # Re-encode video on the GPU (NVENC constant quality)
+            cmd.extend(['-c:v', self._hw_encoder, '-preset', 'p4', '-cq', '23'])
         else:
             # Re-encode video (smaller file, quality loss)
             cmd.extend(['-c:v', 'libx264', '-crf', '23'])
         
-        # Audio encoding settings
-        cmd.extend([
-            '-c:a', 'aac',  # Use AAC audio codec
-            '-b:a', '128k',  # Audio bitrate
-            '-ac', '2',  # Stereo
-            '-ar', '44100'  # Sample rate
-        ])
+        if copy_audio:
+            # Audio already fits the container: remux without re-encoding
+            cmd.extend(['-c:a', 'copy'])
+        else:
+            # Audio encoding settings
+            cmd.extend([
+                '-c:a', 'aac',  # Use AAC audio codec
+                '-b:a', '128k',  # Audio bitrate
+                '-ac', '2',  # Stereo
+                '-ar', '44100'  # Sample rate
+            ])
         
         # Map streams
         cmd.extend([
@@ -501,13 +1169,13 @@ class VideoMuxer:
             '-avoid_negative_ts', 'make_zero',  # Handle timing issues
         ])
         
-        # Format-specific options
-        if target_format == 'mp4':
+        # Format-specific options; the moov rewrite only pays off for deliverables
+        if is_final and target_format in _FASTSTART_FORMATS:
             cmd.extend(['-movflags', '+faststart'])  # Optimize for streaming
         
-        cmd.append(output_path)
+        cmd.append(_OUTPUT_SLOT)
         
-        return cmd
+        return tuple(cmd)
     
     def _parse_framerate(self, framerate_str: str) -> float:
         """Parse FFmpeg framerate string (e.g., '30000/1001')."""
@@ -521,45 +1189,69 @@ class VideoMuxer:
             return 0.0
     
     def create_preview_video(self, video_url: str, audio_file_path: str, 
-                           output_path: str, duration_seconds: int = 30) -> Dict:
-        """Create a short preview of the dubbed video."""
-        print(Colors.BLUE + f"\n🎬 Preview video készítése ({duration_seconds}s)..." + Colors.ENDC)
+                           output_path: str, duration_seconds: int = 30,
+                           start_seconds: int = 0) -> Dict:
+        """Create a short preview of the dubbed video, starting at start_seconds."""
+        print(Colors.BLUE + f"\n🎬 Preview video készítése ({start_seconds}s-tól, {duration_seconds}s)..." + Colors.ENDC)
         
-        try:
-            # Download short segment of video
-            temp_video = self._download_video_segment(video_url, 0, duration_seconds)
-            
-            # Trim audio to same duration
-            temp_audio = self._trim_audio(audio_file_path, 0, duration_seconds)
-            
-            # Mux preview
-            result = self._mux_video_audio(temp_video, temp_audio, output_path, True, "mp4")
-            
-            # Cleanup temp files
-            for temp_file in [temp_video, temp_audio]:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            
-            result['is_preview'] = True
-            result['preview_duration'] = duration_seconds
-            
-            print(Colors.GREEN + "   ✓ Preview video kész" + Colors.ENDC)
-            return result
-            
-        except Exception as e:
-            raise VideoMuxingError(f"Preview creation failed: {e}")
+        with ExitStack() as cleanup:
+            try:
+                # Download short segment of video
+                temp_video = self._download_video_segment(video_url, start_seconds, duration_seconds)
+                cleanup.callback(self._remove_temp_file, temp_video)
+                
+                # Trim audio to the same window
+                temp_audio = self._trim_audio(audio_file_path, start_seconds, duration_seconds)
+                cleanup.callback(self._remove_temp_file, temp_audio)
+                
+                # Mux preview
+                result = self._mux_video_audio(temp_video, temp_audio, output_path, True, "mp4")
+                
+                result['is_preview'] = True
+                result['preview_duration'] = duration_seconds
+                result['preview_start'] = start_seconds
+                
+                print(Colors.GREEN + "   ✓ Preview video kész" + Colors.ENDC)
+                return result
+                
+            except Exception as e:
+                raise VideoMuxingError(f"Preview creation failed: {e}")
     
     def _download_video_segment(self, video_url: str, start_sec: int, duration_sec: int) -> str:
         """Download a specific segment of video."""
         temp_filename = f"preview_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-        temp_path = os.path.join(self.temp_video_dir, temp_filename)
+        temp_path = self._register_temp_file(os.path.join(self.temp_video_dir, temp_filename))
         
         try:
+            if os.path.isfile(video_url):
+                # Local source: cut it directly, seeking before -i so ffmpeg jumps to
+                # the nearest keyframe instead of decoding from the first frame
+                cmd = [
+                    'ffmpeg',
+                    *_FFMPEG_QUIET,
+                    '-y',
+                    '-ss', str(start_sec),
+                    '-i', video_url,
+                    '-t', str(duration_sec),
+                    '-c', 'copy',
+                    '-avoid_negative_ts', 'make_zero',
+                    temp_path
+                ]
+                result = subprocess.run(
+                    cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=300
+                )
+                
+                if result.returncode != 0:
+                    raise VideoMuxingError(f"Video segment cut failed: {result.stderr}")
+                
+                return temp_path
+            
+            # ffmpeg_i: passes the seek as an input option, so the download starts at the offset
             cmd = [
                 'yt-dlp',
                 '--format', 'bv[ext=mp4]/best[ext=mp4]',
                 '--external-downloader', 'ffmpeg',
-                '--external-downloader-args', f'-ss {start_sec} -t {duration_sec}',
+                '--external-downloader-args', f'ffmpeg_i:-ss {start_sec} -t {duration_sec}',
                 '--output', temp_path,
                 '--no-warnings',
                 video_url
@@ -573,25 +1265,30 @@ class VideoMuxer:
             return temp_path
             
         except Exception as e:
+            self._remove_temp_file(temp_path)
             raise VideoMuxingError(f"Video segment download error: {e}")
     
     def _trim_audio(self, audio_path: str, start_sec: int, duration_sec: int) -> str:
         """Trim audio file to specified duration."""
         temp_filename = f"audio_trim_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-        temp_path = os.path.join(self.temp_video_dir, temp_filename)
+        temp_path = self._register_temp_file(os.path.join(self.temp_video_dir, temp_filename))
         
         try:
             cmd = [
                 'ffmpeg',
+                *_FFMPEG_QUIET,
                 '-y',
-                '-i', audio_path,
                 '-ss', str(start_sec),
+                '-i', audio_path,
                 '-t', str(duration_sec),
                 '-c:a', 'copy',
+                '-avoid_negative_ts', 'make_zero',
                 temp_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = subprocess.run(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
+            )
             
             if result.returncode != 0:
                 raise VideoMuxingError(f"Audio trimming failed: {result.stderr}")
@@ -599,6 +1296,7 @@ class VideoMuxer:
             return temp_path
             
         except Exception as e:
+            self._remove_temp_file(temp_path)
             raise VideoMuxingError(f"Audio trimming error: {e}")
     
     def get_supported_formats(self) -> list:
@@ -1,7 +1,7 @@
 """Text chunking utilities for handling long transcripts."""
 
 import re
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterator
 from ..config import settings
 
 
@@ -28,10 +28,19 @@ class TranscriptChunker:
         Returns:
             List of tuples: (chunk_text, start_pos, end_pos)
         """
+        return list(self.iter_chunks(text))
+    
+    def iter_chunks(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """
+        Yield overlapping chunks lazily, same boundaries as chunk_text.
+        
+        Yields:
+            Tuples: (chunk_text, start_pos, end_pos)
+        """
         if not self.needs_chunking(text):
-            return [(text, 0, len(text))]
+            yield (text, 0, len(text))
+            return
         
-        chunks = []
         text_length = len(text)
         
         # Calculate maximum chunks to process
@@ -63,17 +72,25 @@ class TranscriptChunker:
                     if paragraph_matches:
                         last_para = paragraph_matches[-1]
                         end_pos = search_start + last_para.start()
+                    else:
+                        # Last resort: line break, so timestamped lines stay whole
+                        line_break = text.rfind('\n', search_start, end_pos)
+                        if line_break != -1:
+                            end_pos = line_break + 1
             
             # Extract chunk
             chunk_text = text[start_pos:end_pos].strip()
             if chunk_text:
-                chunks.append((chunk_text, start_pos, end_pos))
+                yield (chunk_text, start_pos, end_pos)
             
-            # Move to next chunk with overlap
-            start_pos = max(end_pos - self.overlap, start_pos + 1)
+            # Move to next chunk with overlap, starting on a line boundary if one is in range
+            next_start = max(end_pos - self.overlap, start_pos + 1)
+            if next_start < end_pos and text[next_start - 1] != '\n':
+                line_break = text.find('\n', next_start, end_pos)
+                if line_break != -1:
+                    next_start = line_break + 1
+            start_pos = next_start
             chunk_count += 1
-        
-        return chunks
     
     def estimate_processing_cost(self, text: str) -> dict:
         """Estimate processing cost and time for chunked text."""
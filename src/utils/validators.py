@@ -9,6 +9,29 @@ from ..core.tts_interface import TTSProvider
 from ..models.dubbing import TTSProviderEnum
 
 
+# YouTube URL prefixes, matched with bytes.startswith after the optional scheme
+_URL_SCHEMES = (b"https://", b"http://")
+_YOUTUBE_HOSTS = (b"www.youtube.com", b"m.youtube.com", b"youtube.com")
+_VIDEO_ID_PREFIXES = (b"youtu.be/",) + tuple(
+    host + path for host in _YOUTUBE_HOSTS for path in (b"/embed/", b"/v/")
+)
+_WATCH_PREFIXES = tuple(host + b"/watch?" for host in _YOUTUBE_HOSTS)
+
+_VIDEO_ID_LENGTH = 11
+_VIDEO_ID_CHARS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+# GCS bucket name pattern, see is_valid_bucket_name
+_BUCKET_NAME_RE = re.compile(r"[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]")
+
+# YouTube URL patterns for video ID extraction
+_VIDEO_ID_PATTERNS = (
+    re.compile(r'youtube\.com/watch\?v=([^&]+)'),
+    re.compile(r'youtu\.be/([^?]+)'),
+    re.compile(r'youtube\.com/embed/([^?]+)'),
+    re.compile(r'youtube\.com/v/([^?]+)'),
+)
+
+
 def is_valid_bucket_name(name: str) -> bool:
     """
     Validate GCS bucket name format.
@@ -23,7 +46,7 @@ def is_valid_bucket_name(name: str) -> bool:
         return False
     
     # Check pattern: lowercase letters, numbers, dashes, dots
-    if not re.fullmatch(r"[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]", name):
+    if not _BUCKET_NAME_RE.fullmatch(name):
         return False
     
     # Additional restrictions
@@ -37,24 +60,53 @@ def is_valid_youtube_url(url: str) -> bool:
     """
     Validate YouTube URL format.
     
+    Accepts youtube.com/watch?v=, /embed/ and /v/ links (with optional www. or m.)
+    and youtu.be short links, each followed by an 11-character video ID.
+    
     Args:
         url: URL to validate
     
     Returns:
         True if valid YouTube URL, False otherwise
     """
-    if not url:
+    if not url or not isinstance(url, str):
         return False
     
-    # Check for common YouTube URL patterns
-    youtube_patterns = [
-        r'youtube\.com/watch',
-        r'youtu\.be/',
-        r'youtube\.com/embed/',
-        r'youtube\.com/v/',
-    ]
+    try:
+        data = url.strip().encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    
+    for scheme in _URL_SCHEMES:
+        if data.startswith(scheme):
+            data = data[len(scheme):]
+            break
     
-    return any(re.search(pattern, url) for pattern in youtube_patterns)
+    for prefix in _VIDEO_ID_PREFIXES:
+        if data.startswith(prefix):
+            return _has_video_id(data[len(prefix):])
+    
+    for prefix in _WATCH_PREFIXES:
+        if data.startswith(prefix):
+            query = data[len(prefix):].split(b'#', 1)[0]
+            for param in query.split(b'&'):
+                if param.startswith(b'v='):
+                    return _has_video_id(param[2:])
+            return False
+    
+    return False
+
+
+def _has_video_id(tail: bytes) -> bool:
+    """Check that tail starts with an 11-character video ID followed by a delimiter or the end."""
+    if len(tail) < _VIDEO_ID_LENGTH:
+        return False
+    
+    # Deleting every allowed byte leaves nothing behind for a well-formed ID
+    if tail[:_VIDEO_ID_LENGTH].translate(None, _VIDEO_ID_CHARS):
+        return False
+    
+    return len(tail) == _VIDEO_ID_LENGTH or tail[_VIDEO_ID_LENGTH:_VIDEO_ID_LENGTH + 1] in b'?&#/'
 
 
 def get_user_inputs() -> Tuple[str, bool, bool]:
@@ -116,16 +168,8 @@ def extract_video_id(url: str) -> Optional[str]:
     Returns:
         Video ID if found, None otherwise
     """
-    # YouTube URL patterns for video ID extraction
-    patterns = [
-        r'youtube\.com/watch\?v=([^&]+)',
-        r'youtu\.be/([^?]+)',
-        r'youtube\.com/embed/([^?]+)',
-        r'youtube\.com/v/([^?]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     
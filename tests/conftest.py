@@ -1,6 +1,7 @@
 """Pytest configuration and shared fixtures for all tests."""
 
 import os
+import sys
 import json
 import tempfile
 import shutil
@@ -12,6 +13,13 @@ from datetime import datetime
 import pytest
 from fastapi.testclient import TestClient
 
+# src.api builds a VideoMuxer at import time, which probes FFmpeg and caches the
+# result; keep that cache out of the real home directory too
+os.environ.setdefault(
+    "FFMPEG_CAPS_CACHE_FILE",
+    os.path.join(tempfile.gettempdir(), "youtube-transcription-tests", "ffmpeg_caps.json")
+)
+
 # Import application components
 from src.api import app
 from src.config import settings, TranslationContext, VertexAIModels
@@ -50,7 +58,7 @@ def temp_dir():
     shutil.rmtree(temp_path, ignore_errors=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_data_dir():
     """Get the test data directory path."""
     return Path(__file__).parent / "test_data"
@@ -94,16 +102,28 @@ def sample_translation():
 
 @pytest.fixture
 def mock_vertex_ai():
-    """Mock Vertex AI client and responses."""
-    with patch('src.core.translator.vertexai') as mock_vertexai:
-        mock_model = MagicMock()
-        mock_response = MagicMock()
-        mock_response.text = "Translated text with timestamps"
-        mock_model.generate_content.return_value = mock_response
-        
-        mock_vertexai.init.return_value = None
-        mock_vertexai.GenerativeModel.return_value = mock_model
-        
+    """Mock Vertex AI client and responses.
+    
+    The translator imports vertexai inside its methods, so the SDK is replaced
+    in sys.modules rather than patched on the translator module.
+    """
+    mock_vertexai = MagicMock()
+    generative_models = mock_vertexai.generative_models
+    # Tests configure GenerativeModel on the top-level mock
+    generative_models.GenerativeModel = mock_vertexai.GenerativeModel
+    
+    mock_model = MagicMock()
+    mock_response = MagicMock()
+    mock_response.text = "Translated text with timestamps"
+    mock_model.generate_content.return_value = mock_response
+    
+    mock_vertexai.init.return_value = None
+    mock_vertexai.GenerativeModel.return_value = mock_model
+    
+    with patch.dict(sys.modules, {
+        'vertexai': mock_vertexai,
+        'vertexai.generative_models': generative_models
+    }):
         yield mock_vertexai
 
 
@@ -211,7 +231,7 @@ def sample_synthesis_request():
 # Mock Response Data Fixtures
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_vertex_responses():
     """Load mock Vertex AI responses."""
     return {
@@ -376,6 +396,14 @@ def generate_mock_video_file(path: str, duration_seconds: float = 10.0):
 # Cleanup Fixtures
 # =============================================================================
 
+@pytest.fixture(autouse=True)
+def ffmpeg_caps_cache_file(tmp_path, monkeypatch):
+    """Write the FFmpeg encoder capability cache to a per-test temp file."""
+    caps_file = tmp_path / "ffmpeg_caps.json"
+    monkeypatch.setattr(settings, "ffmpeg_caps_cache_file", str(caps_file))
+    return caps_file
+
+
 @pytest.fixture(autouse=True)
 def cleanup_test_files(request):
     """Automatically cleanup test files after each test."""
@@ -1,10 +1,13 @@
 """Comprehensive tests for the ElevenLabs synthesizer module."""
 
-import json
+import orjson
 import base64
+import asyncio
+import threading
 import pytest
 from unittest.mock import Mock, MagicMock, patch, call
 from pathlib import Path
+from types import SimpleNamespace
 import tempfile
 import os
 
@@ -17,6 +20,16 @@ from src.config import settings
 from src.models.dubbing import AudioQuality
 
 
+def _resp(status, content=b"", body=None):
+    """Build a lightweight stand-in for an httpx response."""
+    return SimpleNamespace(
+        status_code=status,
+        content=content,
+        text=content.decode("utf-8", "replace"),
+        json=lambda: body
+    )
+
+
 class TestElevenLabsSynthesizer:
     """Test suite for ElevenLabsSynthesizer class."""
     
@@ -29,8 +42,12 @@ class TestElevenLabsSynthesizer:
     @pytest.fixture
     def mock_elevenlabs_data(self, test_data_dir):
         """Load mock ElevenLabs responses from test data."""
-        with open(test_data_dir / "mock_elevenlabs_responses.json", 'r') as f:
-            return json.load(f)
+        return orjson.loads((test_data_dir / "mock_elevenlabs_responses.json").read_bytes())
+    
+    @pytest.fixture
+    def paths(self, temp_dir):
+        """Temporary directory as a Path for building output file paths."""
+        return Path(temp_dir)
     
     @pytest.fixture
     def timed_script(self):
@@ -71,17 +88,17 @@ class TestElevenLabsSynthesizer:
         assert len(segments) == 4  # Excluding [breath] marker
         
         # Check first segment
-        assert segments[0]["text"] == "Welcome to this test video!"
-        assert segments[0]["start_time"] == 1.0
-        assert "end_time" in segments[0]
+        assert segments[0].text == "Welcome to this test video!"
+        assert segments[0].start_time == 1.0
+        assert segments[0].end_time > segments[0].start_time
         
         # Check second segment
-        assert segments[1]["text"] == "This is the second line."
-        assert segments[1]["start_time"] == 5.0
+        assert segments[1].text == "This is the second line."
+        assert segments[1].start_time == 5.0
         
         # Check timing continuity
         for i in range(len(segments) - 1):
-            assert segments[i]["end_time"] <= segments[i + 1]["start_time"]
+            assert segments[i].end_time <= segments[i + 1].start_time
     
     def test_timestamp_extraction(self, synthesizer):
         """Test extraction of timestamps from various formats."""
@@ -94,7 +111,7 @@ class TestElevenLabsSynthesizer:
         
         for script, expected_time in test_cases:
             segments = synthesizer._script_to_elevenlabs_format(script)
-            assert segments[0]["start_time"] == expected_time
+            assert segments[0].start_time == expected_time
     
     def test_special_markers_handling(self, synthesizer):
         """Test that special markers are handled correctly."""
@@ -108,7 +125,7 @@ class TestElevenLabsSynthesizer:
         segments = synthesizer._script_to_elevenlabs_format(script)
         
         # Special markers should be filtered out
-        texts = [seg["text"] for seg in segments]
+        texts = [seg.text for seg in segments]
         assert "First line" in texts
         assert "Second line" in texts
         assert "Third line" in texts
@@ -120,21 +137,18 @@ class TestElevenLabsSynthesizer:
     # =========================================================================
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_single_call_synthesis(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_single_call_synthesis(self, mock_client, synthesizer, timed_script, paths):
         """Test single API call synthesis for short content."""
         # Setup mock
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"fake_audio_data"
-        mock_response.json.return_value = {
+        mock_response = _resp(200, b"fake_audio_data", body={
             "duration_seconds": 15.0,
             "character_count": 100
-        }
+        })
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test_output.mp3"
+        output_path = paths / "test_output.mp3"
         
         result = synthesizer.synthesize_script(
             timed_script,
@@ -157,7 +171,7 @@ class TestElevenLabsSynthesizer:
     # =========================================================================
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_chunked_synthesis(self, mock_client, synthesizer, temp_dir):
+    def test_chunked_synthesis(self, mock_client, synthesizer, paths):
         """Test chunked synthesis for long content."""
         # Generate long script (>50 segments)
         long_script = "\n".join([
@@ -169,19 +183,16 @@ class TestElevenLabsSynthesizer:
         mock_instance = MagicMock()
         mock_responses = []
         for i in range(3):  # Expect 3 chunks
-            response = MagicMock()
-            response.status_code = 200
-            response.content = b"chunk_audio_data_" + str(i).encode()
-            response.json.return_value = {
-                "duration_seconds": 20.0,
-                "character_count": 400
-            }
-            mock_responses.append(response)
+            mock_responses.append(_resp(
+                200,
+                b"chunk_audio_data_" + str(i).encode(),
+                body={"duration_seconds": 20.0, "character_count": 400}
+            ))
         
         mock_instance.post.side_effect = mock_responses
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test_chunked.mp3"
+        output_path = paths / "test_chunked.mp3"
         
         result = synthesizer.synthesize_script(
             long_script,
@@ -203,14 +214,12 @@ class TestElevenLabsSynthesizer:
         """Test voice profile validation and fetching."""
         # Setup mock for voice list
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _resp(200, body={
             "voices": [
                 {"voice_id": "voice1", "name": "Adam"},
                 {"voice_id": "voice2", "name": "Rachel"}
             ]
-        }
+        })
         mock_instance.get.return_value = mock_response
         mock_client.return_value = mock_instance
         
@@ -224,18 +233,16 @@ class TestElevenLabsSynthesizer:
         assert synthesizer.validate_voice_id("invalid_voice") == False
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_voice_not_found_error(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_voice_not_found_error(self, mock_client, synthesizer, timed_script, paths):
         """Test handling of invalid voice ID."""
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.json.return_value = {
+        mock_response = _resp(404, body={
             "error": "Voice not found"
-        }
+        })
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test.mp3"
+        output_path = paths / "test.mp3"
         
         with pytest.raises(VoiceNotFoundError):
             synthesizer.synthesize_script(
@@ -249,7 +256,7 @@ class TestElevenLabsSynthesizer:
     # =========================================================================
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_audio_quality_settings(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_audio_quality_settings(self, mock_client, synthesizer, timed_script, paths):
         """Test different audio quality settings."""
         qualities = [
             (AudioQuality.LOW, "mp3_22050_32"),
@@ -258,14 +265,12 @@ class TestElevenLabsSynthesizer:
         ]
         
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"audio_data"
+        mock_response = _resp(200, b"audio_data")
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
         for quality, expected_format in qualities:
-            output_path = f"{temp_dir}/test_{quality.value}.mp3"
+            output_path = paths / f"test_{quality.value}.mp3"
             
             result = synthesizer.synthesize_script(
                 timed_script,
@@ -283,19 +288,19 @@ class TestElevenLabsSynthesizer:
     # =========================================================================
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_retry_logic(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_retry_logic(self, mock_client, synthesizer, timed_script, paths):
         """Test retry logic on temporary failures."""
         mock_instance = MagicMock()
         
         # First call fails, second succeeds
         mock_responses = [
-            MagicMock(status_code=500),  # Server error
-            MagicMock(status_code=200, content=b"audio_data")  # Success
+            _resp(500),  # Server error
+            _resp(200, b"audio_data")  # Success
         ]
         mock_instance.post.side_effect = mock_responses
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test_retry.mp3"
+        output_path = paths / "test_retry.mp3"
         
         result = synthesizer.synthesize_script(
             timed_script,
@@ -307,18 +312,16 @@ class TestElevenLabsSynthesizer:
         assert mock_instance.post.call_count == 2  # Retried once
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_quota_exceeded_error(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_quota_exceeded_error(self, mock_client, synthesizer, timed_script, paths):
         """Test handling of quota exceeded errors."""
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 429
-        mock_response.json.return_value = {
+        mock_response = _resp(429, body={
             "error": "Quota exceeded"
-        }
+        })
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test.mp3"
+        output_path = paths / "test.mp3"
         
         with pytest.raises(SynthesisError) as exc_info:
             synthesizer.synthesize_script(
@@ -330,18 +333,16 @@ class TestElevenLabsSynthesizer:
         assert "quota" in str(exc_info.value).lower()
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_unauthorized_error(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_unauthorized_error(self, mock_client, synthesizer, timed_script, paths):
         """Test handling of authentication errors."""
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {
+        mock_response = _resp(401, body={
             "error": "Unauthorized"
-        }
+        })
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test.mp3"
+        output_path = paths / "test.mp3"
         
         with pytest.raises(SynthesisError) as exc_info:
             synthesizer.synthesize_script(
@@ -395,7 +396,7 @@ class TestElevenLabsSynthesizer:
     # =========================================================================
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_synthesis_progress_tracking(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_synthesis_progress_tracking(self, mock_client, synthesizer, timed_script, paths):
         """Test progress tracking during synthesis."""
         progress_updates = []
         
@@ -403,13 +404,11 @@ class TestElevenLabsSynthesizer:
             progress_updates.append((message, percentage))
         
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"audio_data"
+        mock_response = _resp(200, b"audio_data")
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test.mp3"
+        output_path = paths / "test.mp3"
         
         result = synthesizer.synthesize_script(
             timed_script,
@@ -427,16 +426,14 @@ class TestElevenLabsSynthesizer:
     # =========================================================================
     
     @patch('src.core.synthesizer.httpx.Client')
-    def test_audio_file_creation(self, mock_client, synthesizer, timed_script, temp_dir):
+    def test_audio_file_creation(self, mock_client, synthesizer, timed_script, paths):
         """Test that audio files are created correctly."""
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"RIFF____WAVEfmt audio_data"  # Fake WAV header
+        mock_response = _resp(200, b"RIFF____WAVEfmt audio_data")  # Fake WAV header
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/test_audio.mp3"
+        output_path = paths / "test_audio.mp3"
         
         result = synthesizer.synthesize_script(
             timed_script,
@@ -452,15 +449,13 @@ class TestElevenLabsSynthesizer:
             content = f.read()
             assert content == mock_response.content
     
-    def test_output_directory_creation(self, synthesizer, timed_script, temp_dir):
+    def test_output_directory_creation(self, synthesizer, timed_script, paths):
         """Test that output directories are created if they don't exist."""
-        nested_path = f"{temp_dir}/nested/deep/path/audio.mp3"
+        nested_path = paths / "nested" / "deep" / "path" / "audio.mp3"
         
         with patch('src.core.synthesizer.httpx.Client') as mock_client:
             mock_instance = MagicMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.content = b"audio_data"
+            mock_response = _resp(200, b"audio_data")
             mock_instance.post.return_value = mock_response
             mock_client.return_value = mock_instance
             
@@ -472,27 +467,126 @@ class TestElevenLabsSynthesizer:
             
             assert os.path.exists(os.path.dirname(nested_path))
     
+    # =========================================================================
+    # Request Pool Tests
+    # =========================================================================
+    
+    def test_synthesis_pool_concurrent_requests(self, synthesizer, paths):
+        """Test that pooled requests are processed with isolated per-request results."""
+        def fake_synthesize(script_text, voice_id, output_path, **kwargs):
+            return {"audio_file_path": output_path, "voice_id": voice_id}
+        
+        async def run_pool():
+            pool = synthesizer.as_pool(max_concurrency=2)
+            request_ids = [
+                pool.submit("[00:00:01] Hello there", f"voice_{i}", paths / f"pool_{i}.mp3")
+                for i in range(3)
+            ]
+            results = [await pool.wait(request_id) for request_id in request_ids]
+            await pool.close()
+            return results
+        
+        with patch.object(synthesizer, 'synthesize_script', side_effect=fake_synthesize):
+            results = asyncio.run(run_pool())
+        
+        assert [r["voice_id"] for r in results] == ["voice_0", "voice_1", "voice_2"]
+        assert results[2]["audio_file_path"] == paths / "pool_2.mp3"
+    
+    def test_synthesis_pool_failure(self, synthesizer, paths):
+        """Test that a failing pooled request raises SynthesisError on wait."""
+        async def run_pool():
+            pool = synthesizer.as_pool()
+            request_id = pool.submit("[00:00:01] Hello there", "test_voice", paths / "fail.mp3")
+            try:
+                await pool.wait(request_id)
+            finally:
+                await pool.close()
+        
+        with patch.object(synthesizer, 'synthesize_script', side_effect=RuntimeError("boom")):
+            with pytest.raises(SynthesisError):
+                asyncio.run(run_pool())
+    
+    def test_synthesis_pool_close_fails_pending_requests(self, synthesizer, paths):
+        """Test that closing the pool fails running and queued requests instead of leaving waiters hanging."""
+        started = threading.Event()
+        release = threading.Event()
+        
+        def blocking_synthesize(script_text, voice_id, output_path, **kwargs):
+            started.set()
+            release.wait(5)
+            return {"audio_file_path": output_path}
+        
+        async def run_pool():
+            pool = synthesizer.as_pool(max_concurrency=1)
+            running = pool.submit("[00:00:01] Hello there", "voice_0", paths / "running.mp3")
+            await asyncio.to_thread(started.wait, 5)
+            queued = pool.submit("[00:00:01] Hello there", "voice_1", paths / "queued.mp3")
+            
+            await pool.close()
+            release.set()
+            
+            statuses = [pool.get_status(running), pool.get_status(queued)]
+            for request_id in (running, queued):
+                with pytest.raises(asyncio.CancelledError):
+                    await asyncio.wait_for(pool.wait(request_id), timeout=1)
+            return statuses
+        
+        with patch.object(synthesizer, 'synthesize_script', side_effect=blocking_synthesize):
+            statuses = asyncio.run(run_pool())
+        
+        assert statuses == ["cancelled", "cancelled"]
+    
+    def test_synthesis_pool_close_fails_requests_waiting_for_semaphore(self, synthesizer, paths):
+        """Test that requests already picked up but blocked on the semaphore are failed on close."""
+        started = threading.Event()
+        release = threading.Event()
+        
+        def blocking_synthesize(script_text, voice_id, output_path, **kwargs):
+            started.set()
+            release.wait(5)
+            return {"audio_file_path": output_path}
+        
+        async def run_pool():
+            pool = synthesizer.as_pool(max_concurrency=1)
+            # Submitted together, so all three join the same batch
+            request_ids = [
+                pool.submit("[00:00:01] Hello there", f"voice_{i}", paths / f"pool_{i}.mp3")
+                for i in range(3)
+            ]
+            await asyncio.to_thread(started.wait, 5)
+            
+            await pool.close()
+            release.set()
+            
+            statuses = [pool.get_status(request_id) for request_id in request_ids]
+            for request_id in request_ids:
+                with pytest.raises(asyncio.CancelledError):
+                    await asyncio.wait_for(pool.wait(request_id), timeout=1)
+            return statuses
+        
+        with patch.object(synthesizer, 'synthesize_script', side_effect=blocking_synthesize):
+            statuses = asyncio.run(run_pool())
+        
+        assert statuses == ["cancelled", "cancelled", "cancelled"]
+    
     # =========================================================================
     # Integration Tests
     # =========================================================================
     
     @patch('src.core.synthesizer.httpx.Client')
     def test_full_synthesis_pipeline(
-        self, mock_client, synthesizer, sample_transcript, temp_dir
+        self, mock_client, synthesizer, sample_transcript, paths
     ):
         """Test complete synthesis pipeline with real-like data."""
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"complete_audio_data"
-        mock_response.json.return_value = {
+        mock_response = _resp(200, b"complete_audio_data", body={
             "duration_seconds": 32.5,
             "character_count": len(sample_transcript)
-        }
+        })
         mock_instance.post.return_value = mock_response
         mock_client.return_value = mock_instance
         
-        output_path = f"{temp_dir}/complete_audio.mp3"
+        output_path = paths / "complete_audio.mp3"
         
         result = synthesizer.synthesize_script(
             sample_transcript,
@@ -1,10 +1,12 @@
 """Comprehensive tests for the video muxer module."""
 
 import os
+import time
+import asyncio
 import tempfile
 import subprocess
 import pytest
-from unittest.mock import Mock, MagicMock, patch, call
+from unittest.mock import Mock, MagicMock, AsyncMock, patch, call
 from pathlib import Path
 
 from src.core.video_muxer import VideoMuxer, VideoMuxingError
@@ -54,6 +56,47 @@ class TestVideoMuxer:
             muxer = VideoMuxer()
             mock_makedirs.assert_called_with(settings.temp_video_dir, exist_ok=True)
     
+    def test_encoder_caps_probed_once_and_persisted(self, monkeypatch, ffmpeg_caps_cache_file):
+        """Test that encoder detection is shared across instances and launches."""
+        monkeypatch.setattr(VideoMuxer, '_ENCODER_CAPS', None)
+        
+        version = MagicMock(returncode=0, stdout="ffmpeg version 6.1")
+        encoders = MagicMock(returncode=0, stdout=" V....D h264_nvenc")
+        test_encode = MagicMock(returncode=0, stdout="")
+        
+        with patch('subprocess.run', side_effect=[version, encoders, test_encode]) as mock_run:
+            VideoMuxer()
+            VideoMuxer()
+        
+        assert mock_run.call_count == 3
+        assert ffmpeg_caps_cache_file.exists()
+        
+        # A new process with the same FFmpeg build reads the file instead of probing
+        monkeypatch.setattr(VideoMuxer, '_ENCODER_CAPS', None)
+        with patch('subprocess.run', return_value=version) as mock_run:
+            assert VideoMuxer._detect_encoders() == {"hw_encoder": "h264_nvenc"}
+        
+        assert mock_run.call_count == 1
+    
+    def test_encoder_caps_negative_result_not_persisted(self, monkeypatch, ffmpeg_caps_cache_file):
+        """Test that a failed NVENC probe is repeated on the next launch."""
+        monkeypatch.setattr(VideoMuxer, '_ENCODER_CAPS', None)
+        
+        version = MagicMock(returncode=0, stdout="ffmpeg version 6.1")
+        encoders = MagicMock(returncode=0, stdout=" V....D libx264")
+        
+        with patch('subprocess.run', side_effect=[version, encoders]):
+            assert VideoMuxer._detect_encoders() == {"hw_encoder": None}
+        
+        assert not ffmpeg_caps_cache_file.exists()
+        
+        # Next launch probes again, e.g. once the driver is available
+        monkeypatch.setattr(VideoMuxer, '_ENCODER_CAPS', None)
+        with patch('subprocess.run', side_effect=[version, encoders]) as mock_run:
+            assert VideoMuxer._detect_encoders() == {"hw_encoder": None}
+        
+        assert mock_run.call_count == 2
+    
     # =========================================================================
     # Video Download Tests
     # =========================================================================
@@ -80,6 +123,28 @@ class TestVideoMuxer:
         format_str = ydl_opts.get('format', '')
         assert 'video' in format_str.lower() or 'bestvideo' in format_str
     
+    @pytest.mark.parametrize("target_format,vcodec,sort_codec", [
+        ("mp4", "avc1", "h264"),
+        ("webm", "vp9", "vp9")
+    ])
+    @patch('subprocess.run')
+    def test_download_video_matches_container_codec(
+        self, mock_run, muxer, target_format, vcodec, sort_codec
+    ):
+        """Test that the download prefers a video codec the container can stream-copy."""
+        mock_result = MagicMock()
+        mock_result.returncode = 1
+        mock_result.stderr = "stop after building the command"
+        mock_run.return_value = mock_result
+        
+        with pytest.raises(VideoMuxingError):
+            muxer._download_video_only("https://youtube.com/watch?v=test", target_format)
+        
+        cmd = mock_run.call_args[0][0]
+        format_spec = cmd[cmd.index("--format") + 1]
+        assert format_spec.startswith(f"bv[vcodec^={vcodec}][ext={target_format}]")
+        assert cmd[cmd.index("--format-sort") + 1] == f"res,fps,vcodec:{sort_codec},br"
+    
     @patch('yt_dlp.YoutubeDL')
     def test_download_video_error_handling(self, mock_ytdl, muxer):
         """Test error handling during video download."""
@@ -156,7 +221,7 @@ class TestVideoMuxer:
         
         cmd = mock_run.call_args[0][0]
         # Should re-encode with specific settings
-        assert any(codec in cmd for codec in ['libx264', 'h264', 'aac'])
+        assert any(codec in cmd for codec in ['libx264', 'h264_nvenc', 'h264', 'aac'])
     
     # =========================================================================
     # Video Format Tests
@@ -194,7 +259,7 @@ class TestVideoMuxer:
         mock_run.return_value = mock_result
         
         format_codecs = {
-            "mp4": ["libx264", "aac"],
+            "mp4": ["libx264", "h264_nvenc", "aac"],
             "webm": ["libvpx", "libvorbis"],
             "avi": ["mpeg4", "mp3"]
         }
@@ -214,36 +279,117 @@ class TestVideoMuxer:
             # At least one expected codec should be in command
             assert any(codec in " ".join(cmd) for codec in expected_codecs)
     
+    @pytest.mark.parametrize("hw_encoder,expected", [
+        ("h264_nvenc", ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"]),
+        (None, ["-c:v", "libx264", "-crf", "23"])
+    ])
+    def test_reencode_encoder_selection(self, muxer, hw_encoder, expected):
+        """Test that re-encoding uses NVENC when detected and libx264 otherwise."""
+        muxer._hw_encoder = hw_encoder
+        muxer._cmd_templates = muxer._build_cmd_templates()
+        
+        cmd = muxer._build_ffmpeg_command("in.mp4", "in.mp3", "out.mp4", False, "mp4")
+        
+        index = cmd.index("-c:v")
+        assert cmd[index:index + len(expected)] == expected
+    
+    @pytest.mark.parametrize("hw_encoder,video_codec,preserve,gpu_decode", [
+        ("h264_nvenc", "h264", False, True),
+        ("h264_nvenc", "vp9", False, False),
+        ("h264_nvenc", "h264", True, False),
+        (None, "h264", False, False)
+    ])
+    def test_cuda_decode_with_nvenc(self, muxer, hw_encoder, video_codec, preserve, gpu_decode):
+        """Test that NVENC re-encodes decode on the GPU when the source codec allows it."""
+        muxer._hw_encoder = hw_encoder
+        muxer._cmd_templates = muxer._build_cmd_templates()
+        
+        cmd = muxer._build_ffmpeg_command(
+            "in.mp4", "in.mp3", "out.mp4", preserve, "mp4", video_codec=video_codec
+        )
+        
+        assert ("-hwaccel" in cmd) == gpu_decode
+        if gpu_decode:
+            assert cmd.index("-hwaccel") < cmd.index("-i")
+            assert cmd[cmd.index("-hwaccel_output_format") + 1] == "cuda"
+    
+    def test_command_template_fills_paths(self, muxer):
+        """Test that cached command templates only swap in the call's paths."""
+        first = muxer._build_ffmpeg_command("a.mp4", "a.mp3", "out_a.mp4", True, "mp4")
+        second = muxer._build_ffmpeg_command("b.mp4", "b.mp3", "out_b.mp4", True, "mp4")
+        
+        assert first[first.index("-i") + 1] == "a.mp4"
+        assert second[-1] == "out_b.mp4"
+        assert [arg for arg in first if not arg.startswith(("a.", "out_a"))] == \
+            [arg for arg in second if not arg.startswith(("b.", "out_b"))]
+    
+    @pytest.mark.parametrize("target_format,is_final,faststart", [
+        ("mp4", True, True),
+        ("mp4", False, False),
+        ("mkv", True, False)
+    ])
+    def test_faststart_only_for_final_outputs(self, muxer, target_format, is_final, faststart):
+        """Test that the moov-atom rewrite is skipped for intermediate files."""
+        cmd = muxer._build_ffmpeg_command(
+            "in.mp4", "in.mp3", f"out.{target_format}", True, target_format, is_final=is_final
+        )
+        
+        assert ("+faststart" in cmd) == faststart
+    
+    @pytest.mark.parametrize("audio_codec,target_format,copied", [
+        ("aac", "mp4", True),
+        ("mp3", "mp4", False),
+        ("opus", "webm", True),
+        (None, "mp4", False)
+    ])
+    def test_audio_stream_copy_when_compatible(self, muxer, audio_codec, target_format, copied):
+        """Test that compatible audio is remuxed instead of re-encoded."""
+        cmd = muxer._build_ffmpeg_command(
+            "in.mp4", "in.audio", f"out.{target_format}", True, target_format, audio_codec
+        )
+        
+        index = cmd.index("-c:a")
+        assert (cmd[index + 1] == "copy") == copied
+        assert cmd[cmd.index("-c:v") + 1] == "copy"
+    
     # =========================================================================
     # Duration Validation Tests
     # =========================================================================
     
-    @patch('subprocess.run')
-    def test_duration_validation(self, mock_run, muxer):
+    @patch('subprocess.Popen')
+    def test_duration_validation(self, mock_popen, muxer):
         """Test video and audio duration compatibility check."""
         # Mock ffprobe for video info
         video_probe = MagicMock()
         video_probe.returncode = 0
-        video_probe.stdout = '{"format": {"duration": "120.5"}}'
+        video_probe.communicate.return_value = (
+            '{"format": {"duration": "120.5"}, '
+            '"streams": [{"codec_type": "video", "width": 1920, "height": 1080}]}',
+            ''
+        )
         
         # Mock ffprobe for audio info
         audio_probe = MagicMock()
         audio_probe.returncode = 0
-        audio_probe.stdout = '{"format": {"duration": "118.2"}}'
+        audio_probe.communicate.return_value = (
+            '{"format": {"duration": "118.2"}, '
+            '"streams": [{"codec_type": "audio", "sample_rate": "44100", "channels": 2}]}',
+            ''
+        )
         
-        mock_run.side_effect = [video_probe, audio_probe]
+        mock_popen.side_effect = [video_probe, audio_probe]
         
-        video_info = muxer._get_video_info("fake_video.mp4")
-        audio_info = muxer._get_audio_info("fake_audio.mp3")
+        # Both probes are spawned before either is waited on
+        video_info, audio_info = muxer._get_info_batch("fake_video.mp4", "fake_audio.mp3")
+        assert mock_popen.call_count == 2
         
         # Small difference should be acceptable
         assert muxer._validate_duration_compatibility(video_info, audio_info)
         
         # Large difference should trigger warning
         audio_info["duration"] = 60.0  # Half of video duration
-        result = muxer._validate_duration_compatibility(video_info, audio_info)
-        # Should still proceed but with warning
-        assert result == True or result == False
+        # Should still proceed but report the mismatch
+        assert not muxer._validate_duration_compatibility(video_info, audio_info)
     
     @patch('subprocess.run')
     def test_get_video_info(self, mock_run, muxer):
@@ -275,6 +421,70 @@ class TestVideoMuxer:
         assert "ffprobe" in cmd
         assert "-print_format" in cmd
         assert "json" in cmd
+        
+        # Bounded probing, and only the fields we parse
+        assert cmd[cmd.index("-probesize") + 1] == "500000"
+        assert cmd[cmd.index("-analyzeduration") + 1] == "500000"
+        assert "-show_entries" in cmd
+        assert "-show_streams" not in cmd
+    
+    @patch('subprocess.run')
+    def test_video_info_cached_until_file_changes(self, mock_run, muxer, mock_video_file):
+        """Test that repeated probes of an unchanged file reuse the ffprobe result."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = '{"format": {"duration": "120.5"}, "streams": [{"codec_type": "video", "width": 1920, "height": 1080}]}'
+        mock_run.return_value = mock_result
+        
+        first = muxer._get_video_info(mock_video_file)
+        second = muxer._get_video_info(mock_video_file)
+        
+        assert first == second
+        assert mock_run.call_count == 1
+        
+        # Rewriting the file changes its size, so it is probed again
+        with open(mock_video_file, 'ab') as f:
+            f.write(b'\x00' * 10)
+        muxer._get_video_info(mock_video_file)
+        
+        assert mock_run.call_count == 2
+    
+    def test_info_batch_shares_probe_cache(self, muxer, mock_video_file, mock_audio_file):
+        """Test that the batch probe only spawns ffprobe for uncached files and fills the cache."""
+        video_result = MagicMock(returncode=0, stderr="")
+        video_result.stdout = '{"format": {"duration": "120.5"}, "streams": [{"codec_type": "video", "width": 1920, "height": 1080}]}'
+        audio_probe = MagicMock(returncode=0)
+        audio_probe.communicate.return_value = (
+            '{"format": {"duration": "118.2"}, "streams": [{"codec_type": "audio", "sample_rate": "44100", "channels": 2}]}',
+            ''
+        )
+        
+        with patch('subprocess.run', return_value=video_result):
+            muxer._get_video_info(mock_video_file)
+        
+        with patch('subprocess.Popen', return_value=audio_probe) as mock_popen:
+            video_info, audio_info = muxer._get_info_batch(mock_video_file, mock_audio_file)
+            assert mock_popen.call_count == 1
+            assert mock_popen.call_args[0][0][-1] == mock_audio_file
+            
+            # Both results are now cached for the next batch
+            muxer._get_info_batch(mock_video_file, mock_audio_file)
+            assert mock_popen.call_count == 1
+        
+        assert video_info["duration"] == 120.5
+        assert audio_info["duration"] == 118.2
+    
+    def test_info_batch_reaps_killed_probes(self, muxer):
+        """Test that ffprobe processes killed on timeout are also waited on."""
+        probe = MagicMock()
+        probe.communicate.side_effect = subprocess.TimeoutExpired("ffprobe", 30)
+        
+        with patch('subprocess.Popen', return_value=probe):
+            with pytest.raises(VideoMuxingError):
+                muxer._get_info_batch("fake_video.mp4", "fake_audio.mp3")
+        
+        assert probe.kill.call_count == 2
+        assert probe.wait.call_count == 2
     
     # =========================================================================
     # Preview Generation Tests
@@ -324,6 +534,90 @@ class TestVideoMuxer:
         # Check for fade filters
         assert "fade" in cmd.lower() or "-vf" in cmd
     
+    @patch('subprocess.run')
+    def test_preview_segment_seeks_before_input(self, mock_run, muxer, mock_video_file, mock_audio_file):
+        """Test that preview cuts use input-side -ss for keyframe seeking."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_run.return_value = mock_result
+        
+        muxer._download_video_segment(mock_video_file, 600, 30)
+        muxer._trim_audio(mock_audio_file, 600, 30)
+        
+        for call in mock_run.call_args_list:
+            cmd = call[0][0]
+            assert cmd.index("-ss") < cmd.index("-i")
+            assert cmd[cmd.index("-ss") + 1] == "600"
+            assert cmd[cmd.index("-t") + 1] == "30"
+    
+    def test_mux_audio_from_bytes_uses_stdin(self, muxer, mock_video_file, temp_dir):
+        """Test that in-memory audio is streamed to ffmpeg instead of written to disk."""
+        process = MagicMock()
+        process.returncode = 1
+        process.communicate = AsyncMock(return_value=(b"", b"Invalid data found"))
+        
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=process)) as mock_exec:
+            with pytest.raises(VideoMuxingError):
+                muxer._mux_video_audio_from_bytes(mock_video_file, b"ID3audio", f"{temp_dir}/output.mp4")
+        
+        args = list(mock_exec.call_args[0])
+        assert args[args.index(mock_video_file) + 2] == "pipe:0"
+        assert mock_exec.call_args[1]["stdin"] == asyncio.subprocess.PIPE
+        assert process.communicate.call_args[1]["input"] == b"ID3audio"
+    
+    def test_mux_multiple_outputs_single_process(self, muxer, mock_video_file, mock_audio_file, temp_dir):
+        """Test that full and preview outputs are written by one ffmpeg invocation."""
+        process = MagicMock()
+        process.returncode = 1
+        process.communicate = AsyncMock(return_value=(b"", b"stop after building the command"))
+        
+        outputs = [
+            {"output_path": f"{temp_dir}/full.mp4"},
+            {"output_path": f"{temp_dir}/preview.mp4", "duration_seconds": 30}
+        ]
+        
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=process)) as mock_exec:
+            with pytest.raises(VideoMuxingError):
+                muxer.mux_multiple(mock_video_file, mock_audio_file, outputs)
+        
+        mock_exec.assert_called_once()
+        args = list(mock_exec.call_args[0])
+        assert args.count("-i") == 2
+        assert args.count("-map") == 4
+        
+        # The duration limit applies to the preview output only
+        full_index = args.index(f"{temp_dir}/full.mp4")
+        assert args.index("-t") > full_index
+        assert args[args.index("-t") + 1] == "30"
+    
+    def test_mux_multiple_inputs_independent_of_output_order(self, muxer, mock_video_file, mock_audio_file, temp_dir):
+        """Test that global/input options are built once, not taken from the first output."""
+        muxer._hw_encoder = "h264_nvenc"
+        muxer._cmd_templates = muxer._build_cmd_templates()
+        
+        process = MagicMock()
+        process.returncode = 1
+        process.communicate = AsyncMock(return_value=(b"", b"stop after building the command"))
+        
+        # Stream-copy output first, NVENC re-encode second
+        outputs = [
+            {"output_path": f"{temp_dir}/full.mp4"},
+            {"output_path": f"{temp_dir}/small.mp4", "preserve_quality": False}
+        ]
+        
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=process)) as mock_exec:
+            with pytest.raises(VideoMuxingError):
+                muxer.mux_multiple(mock_video_file, mock_audio_file, outputs, video_codec="h264")
+        
+        args = list(mock_exec.call_args[0])
+        first_output = args.index(f"{temp_dir}/full.mp4")
+        
+        # GPU decoding serves the re-encoding output even though it is listed second
+        assert args.index("-hwaccel") < args.index("-i")
+        assert args.count("-i") == 2
+        assert args[args.index("-c:v") + 1] == "copy"
+        assert args[args.index("-c:v", first_output) + 1] == "h264_nvenc"
+    
     # =========================================================================
     # Temp File Management Tests
     # =========================================================================
@@ -348,6 +642,28 @@ class TestVideoMuxer:
         for temp_file in temp_files:
             assert not os.path.exists(temp_file)
     
+    def test_stale_temp_file_cleanup(self, muxer, temp_dir):
+        """Test that only the muxer's own temp files older than the cutoff are removed."""
+        muxer.temp_video_dir = temp_dir
+        stale_files = [
+            os.path.join(temp_dir, name)
+            for name in ("video_stale.mp4", "preview_stale.mp4", "audio_trim_stale.mp3")
+        ]
+        fresh_file = os.path.join(temp_dir, "video_fresh.mp4")
+        foreign_file = os.path.join(temp_dir, "dubbed_output.mp4")
+        for path in stale_files + [fresh_file, foreign_file]:
+            with open(path, 'w') as f:
+                f.write("temp")
+        
+        two_hours_ago = time.time() - 2 * 3600
+        for path in stale_files + [foreign_file]:
+            os.utime(path, (two_hours_ago, two_hours_ago))
+        
+        assert muxer.cleanup_stale_temp_files(max_age_seconds=3600) == len(stale_files)
+        assert not any(os.path.exists(path) for path in stale_files)
+        assert os.path.exists(fresh_file)
+        assert os.path.exists(foreign_file)  # Shared directory: other files are left alone
+    
     def test_cleanup_on_error(self, muxer, mock_video_file, temp_dir):
         """Test that temp files are cleaned up even on error."""
         with patch('subprocess.run') as mock_run:
@@ -389,6 +705,27 @@ class TestVideoMuxer:
         
         assert result == False
     
+    def test_ffmpeg_runs_async_without_stdin(self, muxer, mock_video_file, mock_audio_file, temp_dir):
+        """Test that muxing runs ffmpeg as an asyncio subprocess detached from stdin."""
+        process = MagicMock()
+        process.returncode = 1
+        process.communicate = AsyncMock(return_value=(b"", b"Invalid input format"))
+        
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=process)) as mock_exec:
+            with pytest.raises(VideoMuxingError) as exc_info:
+                muxer._mux_video_audio(
+                    mock_video_file, mock_audio_file, f"{temp_dir}/output.mp4", True, "mp4"
+                )
+        
+        assert "Invalid input format" in str(exc_info.value)
+        args, kwargs = mock_exec.call_args
+        assert "-nostdin" in args
+        assert kwargs["stdin"] == asyncio.subprocess.DEVNULL
+        
+        # Only errors reach stderr, and stdout is never buffered
+        assert args[args.index("-loglevel") + 1] == "error"
+        assert kwargs["stdout"] == asyncio.subprocess.DEVNULL
+    
     def test_missing_audio_file(self, muxer, mock_video_file, temp_dir):
         """Test handling of missing audio file."""
         output_path = f"{temp_dir}/output.mp4"
@@ -440,7 +777,10 @@ class TestVideoMuxer:
         # Mock video info with duration > 30 minutes
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = '{"format": {"duration": "2100.0"}}'  # 35 minutes
+        mock_result.stdout = (
+            '{"format": {"duration": "2100.0"}, '  # 35 minutes
+            '"streams": [{"codec_type": "video", "width": 1920, "height": 1080}]}'
+        )
         mock_run.return_value = mock_result
         
         info = muxer._get_video_info("long_video.mp4")
@@ -453,6 +793,36 @@ class TestVideoMuxer:
         
         assert "30 minutes" in str(exc_info.value) or "length" in str(exc_info.value).lower()
     
+    def test_mux_rejects_long_video_without_extra_probe(self, muxer, mock_video_file, mock_audio_file, temp_dir):
+        """Test that muxing rejects over-long videos using the info it already probed."""
+        video_info = {"duration": 2100.0, "resolution": "1920x1080", "codec": "h264"}
+        audio_info = {"duration": 2100.0, "sample_rate": 44100, "codec": "mp3"}
+        
+        with patch.object(muxer, '_get_info_batch', return_value=(video_info, audio_info)), \
+                patch('subprocess.run') as mock_run:
+            with pytest.raises(VideoMuxingError, match="exceeds"):
+                muxer.replace_audio_in_video(mock_video_file, mock_audio_file, f"{temp_dir}/output.mp4")
+        
+        mock_run.assert_not_called()
+    
+    @patch('subprocess.run')
+    def test_video_length_check_uses_duration_only_probe(self, mock_run, muxer):
+        """Test that a standalone length check probes only the container duration."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = "2100.000000\n"  # 35 minutes
+        mock_run.return_value = mock_result
+        
+        with pytest.raises(VideoMuxingError):
+            muxer._validate_video_length("long_video.mp4")
+        
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-show_entries") + 1] == "format=duration"
+        assert "json" not in cmd
+        
+        mock_result.stdout = "600.0\n"
+        assert muxer._validate_video_length("short_video.mp4") == 600.0
+    
     # =========================================================================
     # Integration Tests
     # =========================================================================